@@ -1,5 +1,5 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks, Request
+from fastapi.responses import FileResponse, Response
 from sqlalchemy.orm import Session
 from typing import List
 import os
@@ -15,12 +15,13 @@ from app.schemas import (
 )
 from app.models import Resume, User
 from app.config import settings
-from app.services.parser import ResumeParser, get_resume_parser
+from app.services.parser import get_resume_parser
 from app.services.scorer import ResumeScorer
 from app.services.role_matcher import RoleMatcher
 from app.services.section_analyzer import SectionAnalyzer
 from app.services.llm_diagnostic import LLMDiagnostic, prepare_diagnostic_data
 from app.services.ats_issue_detector import ATSIssueDetector
+from app.services.textkernel_parser import notify_document_ready, webhook_document_identifier, webhook_token_valid
 # TODO: Re-enable for later development
 # from app.services.skill_suggester import SkillSuggester
 
@@ -37,6 +38,37 @@ async def get_parser_info():
     return parser.get_parser_info()
 
 
+@router.post("/affinda/webhook")
+async def affinda_webhook(request: Request):
+    """
+    Receive Affinda document-parsed callbacks (enabled with AFFINDA_CALLBACK_URL).
+    Requires the AFFINDA_WEBHOOK_SECRET token that the callback URL carries, echoes
+    X-Hook-Secret to confirm a subscription, then wakes the async parse waiting on
+    the document; that parse fetches the result itself.
+    """
+    if not settings.affinda_callback_url:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not webhook_token_valid(request.query_params.get("token")):
+        raise HTTPException(status_code=403, detail="Invalid webhook token")
+    
+    hook_secret = request.headers.get("X-Hook-Secret")
+    if hook_secret:
+        return Response(status_code=200, headers={"X-Hook-Secret": hook_secret})
+    
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Webhook payload is not valid JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Webhook payload must be a JSON object")
+    
+    identifier = webhook_document_identifier(body)
+    if not identifier:
+        raise HTTPException(status_code=400, detail="Webhook payload has no document identifier")
+    await notify_document_ready(identifier)
+    return {"status": "ok"}
+
+
 @router.post("/parse", response_model=ResumeUploadResponse)
 async def parse_resume(
     file: UploadFile = File(...),
@@ -101,7 +133,7 @@ def parse_resume_task(resume_id: int, file_path: str, file_type: str):
     db = SessionLocal()
     try:
         print(f"[PARSE TASK] Starting parse for resume {resume_id}")
-        parser = ResumeParser()
+        parser = get_resume_parser()
         parsed_data = parser.parse(file_path, file_type)
         
         print(f"[PARSE TASK] Parse completed. Data keys: {list(parsed_data.keys()) if isinstance(parsed_data, dict) else 'Not a dict'}")
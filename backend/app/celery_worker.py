@@ -24,11 +24,11 @@ celery_app.conf.update(
 @celery_app.task(name="parse_resume")
 def parse_resume_task(resume_id: int, file_path: str, file_type: str):
     """Celery task for parsing resumes"""
-    from app.services.parser import ResumeParser
+    from app.services.parser import get_resume_parser
     from app.database import SessionLocal
     from app.models import Resume
     
-    parser = ResumeParser()
+    parser = get_resume_parser()
     parsed_data = parser.parse(file_path, file_type)
     
     # Update resume in database
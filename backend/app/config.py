@@ -28,6 +28,12 @@ class Settings(BaseSettings):
     textkernel_api_key: str = ""  # For backward compatibility, but use AFFINDA_API_KEY env var instead
     textkernel_api_url: str = "https://api.textkernel.com/tx/v10/parser"  # Legacy, not used with Affinda
     affinda_workspace_id: str = ""  # AFFINDA_WORKSPACE_ID env var
+    affinda_region: str = "us1"  # AFFINDA_REGION env var, e.g. "eu1" for the EU API host
+    affinda_cache_ttl: int = 7 * 24 * 60 * 60  # Seconds to reuse a parse result for identical file contents
+    affinda_concurrency: int = 8  # Max documents in flight at once when batch parsing
+    spacy_batch_processes: int = 1  # SPACY_BATCH_PROCESSES env var; worker processes for spaCy batch NER (forced to 1 on GPU and in daemonic workers)
+    affinda_callback_url: str = ""  # AFFINDA_CALLBACK_URL env var; public URL of POST /api/affinda/webhook, sent as callbackUrl on async uploads (unset: poll)
+    affinda_webhook_secret: str = ""  # AFFINDA_WEBHOOK_SECRET env var; shared token appended to the callback URL and required by the webhook
     
     # AWS S3
     aws_access_key_id: str = ""
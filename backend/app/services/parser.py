@@ -11,6 +11,7 @@ uniqueness (ATS diagnostics from PyMuPDF).
 """
 
 from typing import Dict, Any
+from functools import lru_cache
 import os
 from app.config import settings
 from app.services.base_parser import BaseResumeParser
@@ -126,6 +127,7 @@ class ResumeParser:
 
 
 # Convenience function for backward compatibility
+@lru_cache()
 def get_resume_parser() -> ResumeParser:
-    """Factory function to get configured resume parser instance"""
+    """Return the shared resume parser, built on first use so the spaCy model and Affinda session load once per process"""
     return ResumeParser()
@@ -7,13 +7,37 @@ This service implements the hybrid approach:
 """
 
 from typing import Dict, Any, List
-import fitz  # PyMuPDF
 import re
 
 
+# Email and phone alternated so each contact block is scanned in a single pass
+_CONTACT_RE = re.compile(
+    r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+    r'|(?P<phone>\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b)'
+)
+
+
 class SectionAnalyzer:
     """Analyzes specific resume sections on-demand"""
     
+    # Header keywords that open each analyzable section
+    _SECTION_HEADERS = {
+        'skills': frozenset({'skills', 'technical skills', 'core competencies', 'technologies', 'expertise'}),
+        'experience': frozenset({'experience', 'work experience', 'employment', 'work history', 'professional experience'}),
+        'education': frozenset({'education', 'academic', 'academic background'}),
+        'contact_info': frozenset()  # Contact is usually at top, not a section
+    }
+    
+    # "header:" variants matched anywhere in a block (e.g. "Skills: Python, SQL")
+    _SECTION_HEADER_COLON_VARIANTS = {
+        section: tuple(f"{header}:" for header in headers)
+        for section, headers in _SECTION_HEADERS.items()
+    }
+    
+    # Headers that end the current section
+    _NEXT_SECTION_HEADERS = ('experience', 'education', 'skills', 'projects',
+                             'certifications', 'awards', 'summary', 'objective')
+    
     def __init__(self):
         pass
     
@@ -290,33 +314,25 @@ class SectionAnalyzer:
         section: str
     ) -> List[Dict[str, Any]]:
         """Find blocks belonging to a specific section"""
-        section_headers = {
-            'skills': ['skills', 'technical skills', 'core competencies', 'technologies', 'expertise'],
-            'experience': ['experience', 'work experience', 'employment', 'work history', 'professional experience'],
-            'education': ['education', 'academic', 'academic background'],
-            'contact_info': []  # Contact is usually at top, not a section
-        }
-        
-        headers = section_headers.get(section, [])
+        headers = self._SECTION_HEADERS.get(section)
         if not headers:
             return []
+        colon_variants = self._SECTION_HEADER_COLON_VARIANTS[section]
         
         section_blocks = []
         in_section = False
         
-        for i, block in enumerate(blocks):
+        for block in blocks:
             text = block.get('text', '').lower().strip()
             
             # Check if this is the section header
-            if any(header == text or f"{header}:" in text for header in headers):
+            if text in headers or any(variant in text for variant in colon_variants):
                 in_section = True
                 continue
             
             # Check if we hit the next section
             if in_section:
-                next_section_headers = ['experience', 'education', 'skills', 'projects', 
-                                       'certifications', 'awards', 'summary', 'objective']
-                if any(h in text and len(text) < 50 for h in next_section_headers):
+                if len(text) < 50 and any(h in text for h in self._NEXT_SECTION_HEADERS):
                     break
                 
                 section_blocks.append(block)
@@ -450,16 +466,21 @@ class SectionAnalyzer:
         has_email = bool(contact.get('email') or parsed_data.get('email'))
         has_phone = bool(contact.get('phone') or parsed_data.get('phone'))
         
-        # Find email/phone in blocks
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'\b(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})\b'
-        
         # Check first few blocks (usually header area)
         for block in blocks[:10]:
+            if has_email and has_phone:
+                break
             text = block.get('text', '')
             
+            # Find email/phone in one scan of the block
+            found = set()
+            for match in _CONTACT_RE.finditer(text):
+                found.add(match.lastgroup)
+                if len(found) == 2:
+                    break
+            
             # Email found but not extracted
-            if re.search(email_pattern, text) and not has_email:
+            if 'email' in found and not has_email:
                 region = block.get('region', 'body')
                 if region in ['header', 'footer']:
                     formatting_issues.append(f"Email found in {region} region")
@@ -473,7 +494,7 @@ class SectionAnalyzer:
                 })
             
             # Phone found but not extracted
-            if re.search(phone_pattern, text) and not has_phone:
+            if 'phone' in found and not has_phone:
                 region = block.get('region', 'body')
                 if region in ['header', 'footer']:
                     formatting_issues.append(f"Phone found in {region} region")
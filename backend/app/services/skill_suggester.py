@@ -1,4 +1,5 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
+import itertools
 import os
 from openai import OpenAI
 
@@ -144,9 +145,18 @@ Format your response as JSON array with objects containing: skill, importance, r
                 "nice_to_have": ["Docker", "CI/CD", "Security"]
             }
         
-        suggestions = []
-        
-        # Check which skills are missing
+        return list(itertools.islice(
+            self._iter_fallback_suggestions(target_role, current_skills, role_skills),
+            7
+        ))  # Return top 7 suggestions
+    
+    def _iter_fallback_suggestions(
+        self,
+        target_role: str,
+        current_skills: List[str],
+        role_skills: Dict[str, List[str]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield suggestions for missing skills, most important first"""
         for importance, skills in [
             ("critical", role_skills["critical"]),
             ("recommended", role_skills["recommended"]),
@@ -154,14 +164,12 @@ Format your response as JSON array with objects containing: skill, importance, r
         ]:
             for skill in skills:
                 if skill.lower() not in current_skills:
-                    suggestions.append({
+                    yield {
                         "skill": skill,
                         "importance": importance,
                         "reason": self._get_skill_reason(skill, target_role, importance),
                         "learning_resources": self._get_learning_resources(skill)
-                    })
-        
-        return suggestions[:7]  # Return top 7 suggestions
+                    }
     
     def _get_skill_reason(self, skill: str, target_role: str, importance: str) -> str:
         """Generate reason for skill suggestion"""
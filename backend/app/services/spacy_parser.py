@@ -7,26 +7,245 @@ to provide commercial-grade parsing quality.
 
 import fitz  # PyMuPDF
 from docx import Document
+import multiprocessing
 import re
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 import spacy
 from datetime import datetime
 from dateutil import parser as date_parser
+from app.config import settings
 from app.services.base_parser import BaseResumeParser
 
+try:
+    import ahocorasick  # Optional: single-pass multi-keyword matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2  # Optional: linear-time regex engine for whole-text scans
+except ImportError:
+    re2 = None
+
+
+def _compile_linear(pattern: str) -> re.Pattern:
+    """Compile with RE2 when installed (falling back per pattern if RE2 rejects it), else with re"""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
+# Patterns are compiled once at import time; the helpers below run per line.
+# Only the scans over the whole raw text go through _compile_linear; on short
+# per-line strings RE2's call overhead outweighs its linear-time guarantee.
+_EMAIL_RE = _compile_linear(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = _compile_linear(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+
+_DATE_MONTH_RE = re.compile(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\b', re.IGNORECASE)  # Jan 2020
+_DATE_SLASH_RE = re.compile(r'\b\d{1,2}/\d{4}\b')  # 01/2020
+_DATE_YEAR_RE = re.compile(r'\b\d{4}\b')  # 2020
+_PRESENT_RE = re.compile(r'\b(?:Present|Current|Ongoing|Now)\b', re.IGNORECASE)
+# All date forms fused into one alternation so a header is scanned once,
+# yielding dates in the order they appear
+_DATES_RE = re.compile(
+    "|".join(p.pattern for p in (_DATE_MONTH_RE, _DATE_SLASH_RE, _DATE_YEAR_RE, _PRESENT_RE)),
+    re.IGNORECASE
+)
+_PRESENT_WORDS = frozenset(["present", "current", "ongoing", "now"])
+_DATE_SEP_RE = re.compile(r'\s*[-–—]\s*')
+
+_LOCATION_RE = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),\s*([A-Z]{2}|[A-Z][a-z]+)\b')
+_DIGITS4_RE = re.compile(r'\d{4}')
+_AT_WORD_RE = re.compile(r'\bat\b', re.IGNORECASE)
+_BULLET_RE = re.compile(r'^[•·∙▪▫◦‣⁃○●★☆♦◆■□-]\s+')
+
+_GPA_RES = (
+    re.compile(r'GPA:?\s*(\d+\.\d+)\s*(?:/\s*(\d+\.\d+))?', re.IGNORECASE),
+    re.compile(r'(\d+\.\d+)\s*/\s*(\d+\.\d+)\s+GPA', re.IGNORECASE),
+    re.compile(r'(\d+\.\d+)\s+GPA', re.IGNORECASE),
+)
+_GPA_CLEAN_RES = (
+    re.compile(r'GPA:?\s*\d+\.\d+(?:\s*/\s*\d+\.\d+)?', re.IGNORECASE),
+    re.compile(r'\d+\.\d+\s*/\s*\d+\.\d+\s+GPA', re.IGNORECASE),
+    re.compile(r'\d+\.\d+\s+GPA', re.IGNORECASE),
+)
+
+
+def _union(*patterns: re.Pattern) -> re.Pattern:
+    """Combine compiled patterns into one alternation, keeping each one's case sensitivity"""
+    return re.compile("|".join(
+        f"(?i:{p.pattern})" if p.flags & re.IGNORECASE else f"(?:{p.pattern})"
+        for p in patterns
+    ))
+
+
+# Dates (and GPA) stripped from job and education header fields in one pass.
+# Locations must be removed in a second pass afterwards: in a single alternation
+# _LOCATION_RE would match "Engineer, Jan" before the date pattern reaches "Jan 2020",
+# turning "Software Engineer, Jan 2020" into "" instead of "Software Engineer,".
+_JOB_NOISE_RE = _union(_DATE_MONTH_RE, _DATE_SLASH_RE, _DATE_YEAR_RE, _PRESENT_RE)
+_EDUCATION_NOISE_RE = _union(*_GPA_CLEAN_RES, _DATE_MONTH_RE, _DATE_SLASH_RE, _DATE_YEAR_RE)
+
+_MAJOR_RES = (
+    re.compile(r'(?:major|concentration|specialization|field):\s*([^,\n]+)'),
+    re.compile(r'\bin\s+([A-Z][^,\n]{2,50})'),  # "Bachelor in Computer Science"
+    re.compile(r'of\s+([A-Z][^,\n]{2,50})'),  # "Bachelor of Science"
+)
+_MAJOR_TRAILER_RE = re.compile(r'\s*(?:from|at|,).*$')
+
+_SKILL_SPLIT_RE = re.compile(r'[,;|•·]')
+# Matched against the lowercased candidate. The former case-sensitive
+# '^[A-Z][a-z]+ \d{4}$' ("January 2020") and '^GPA' checks could never match
+# lowercased text, so they are left out rather than widened to catch real
+# skills such as "Excel 2016".
+_NON_SKILL_RE = re.compile(
+    r'^\d{4}$'  # Just a year
+    r'|^\d{1,2}/\d{1,2}/\d{2,4}$'  # Date
+    r'|university$|college$|school$'  # School names
+)
+_NON_SKILL_WORDS = frozenset([
+    'present', 'current', 'ongoing', 'volunteer', 'member', 'president', 'vice president'
+])
+
+# Keywords that open each extracted section (matched as substrings of a line)
+_SUMMARY_KEYWORDS = (
+    "summary", "objective", "profile", "about",
+    "professional summary", "career objective"
+)
+_EXPERIENCE_KEYWORDS = ("experience", "work history", "employment", "work experience", "professional experience")
+_EDUCATION_KEYWORDS = ("education", "academic", "qualification", "academic background")
+_SKILLS_KEYWORDS = ("skills", "technical skills", "competencies", "expertise", "technologies")
+_CERT_KEYWORDS = ("certification", "certificate", "license")
+_SECTION_KEYWORDS = {
+    "summary": _SUMMARY_KEYWORDS,
+    "experience": _EXPERIENCE_KEYWORDS,
+    "education": _EDUCATION_KEYWORDS,
+    "skills": _SKILLS_KEYWORDS,
+    "certifications": _CERT_KEYWORDS,
+}
+
+# Keywords marking a degree or an institution line within education
+_DEGREE_KEYWORDS = ('bachelor', 'master', 'phd', 'ph.d', 'b.s.', 'b.a.', 'm.s.', 'm.a.',
+                    'associate', 'diploma', 'certificate', 'degree', 'bs', 'ba', 'ms', 'ma')
+_INSTITUTION_KEYWORDS = ('university', 'college', 'institute', 'school')
+
+_KEYWORD_CATEGORIES = {
+    **_SECTION_KEYWORDS,
+    "degree": _DEGREE_KEYWORDS,
+    "institution": _INSTITUTION_KEYWORDS,
+}
+
+
+def _build_keyword_automaton():
+    """Build an Aho-Corasick automaton mapping each keyword to its categories"""
+    if ahocorasick is None:
+        return None
+    
+    keyword_categories: Dict[str, set] = {}
+    for category, keywords in _KEYWORD_CATEGORIES.items():
+        for keyword in keywords:
+            keyword_categories.setdefault(keyword, set()).add(category)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, categories in keyword_categories.items():
+        automaton.add_word(keyword, frozenset(categories))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+def _keyword_categories(line_lower: str) -> set:
+    """Return the keyword categories (section names, "degree", "institution") found in a lowercased line"""
+    if _KEYWORD_AUTOMATON is not None:
+        found = set()
+        for _, categories in _KEYWORD_AUTOMATON.iter(line_lower):
+            found.update(categories)
+        return found
+    
+    return {
+        category for category, keywords in _KEYWORD_CATEGORIES.items()
+        if any(keyword in line_lower for keyword in keywords)
+    }
+
+# Common section headers (expanded list)
+_SECTION_HEADERS = frozenset([
+    "summary", "objective", "experience", "education", "skills", "relevant experience",
+    "certifications", "projects", "awards", "publications",
+    "volunteer", "languages", "interests", "references",
+    "activities", "extracurricular", "leadership", "involvement",
+    "honors", "achievements", "professional development",
+    "training", "courses", "portfolio", "research",
+    "teaching", "speaking", "presentations", "patents",
+    "memberships", "affiliations", "community service"
+])
+
+# Only NER (doc.ents) is consumed, so the rest of the pipeline is skipped at load
+_UNUSED_PIPES = ["parser", "tagger", "lemmatizer", "attribute_ruler"]
+
+
+# Line boundaries recognised by str.splitlines
+_LINE_BREAKS = "\r\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+class _EntityIndex:
+    """Named entities of one parsed document, looked up by resume line"""
+    
+    def __init__(self, doc, lines: List[str]):
+        """`lines` is the document text split with splitlines(keepends=True)"""
+        self._ents = list(doc.ents)  # spaCy yields these sorted by start_char
+        self._ent_starts = [ent.start_char for ent in self._ents]
+        
+        # Character offset and content length of each line within the document text
+        self._line_starts = []
+        self._line_lengths = []
+        offset = 0
+        for line in lines:
+            self._line_starts.append(offset)
+            self._line_lengths.append(len(line.rstrip(_LINE_BREAKS)))
+            offset += len(line)
+    
+    def in_span(self, lo: int, hi: int, labels: Tuple[str, ...]) -> List[str]:
+        """Text of entities with one of `labels` lying entirely within [lo, hi)"""
+        found = []
+        i = bisect_left(self._ent_starts, lo)
+        while i < len(self._ents) and self._ent_starts[i] < hi:
+            ent = self._ents[i]
+            if ent.end_char <= hi and ent.label_ in labels:
+                found.append(ent.text)
+            i += 1
+        return found
+    
+    def in_line(self, index: int, labels: Tuple[str, ...]) -> List[str]:
+        """Text of entities with one of `labels` found on line `index`"""
+        lo = self._line_starts[index]
+        return self.in_span(lo, lo + self._line_lengths[index], labels)
+
 
 class SpacyResumeParser(BaseResumeParser):
     """spaCy-based resume parser (free, rule-based)"""
     
     def __init__(self):
+        # Must run before spacy.load so the model is allocated on the GPU;
+        # a no-op returning False on machines without CUDA/cupy.
+        self.device = "gpu" if spacy.prefer_gpu() else "cpu"
         try:
-            self.nlp = spacy.load("en_core_web_lg")
+            self.nlp = spacy.load("en_core_web_lg", disable=_UNUSED_PIPES)
         except OSError:
             # Fallback to smaller model if large model not available
             try:
-                self.nlp = spacy.load("en_core_web_sm")
+                self.nlp = spacy.load("en_core_web_sm", disable=_UNUSED_PIPES)
             except OSError:
                 self.nlp = None
+        
+        # Model name is fixed after load; resolve it once rather than per parse
+        self._model_name = self.nlp.meta.get("name", "") if self.nlp is not None else ""
+        self._model_short = "en_core_web_lg" if "lg" in self._model_name else "en_core_web_sm"
     
     def get_parser_name(self) -> str:
         return "spaCy"
@@ -41,73 +260,154 @@ class SpacyResumeParser(BaseResumeParser):
             raise ValueError("spaCy model not loaded. Run: python -m spacy download en_core_web_lg")
         
         # Extract text
-        if file_type == ".pdf":
-            text = self._extract_pdf_text(file_path)
-        elif file_type == ".docx":
-            text = self._extract_docx_text(file_path)
-        else:
-            raise ValueError(f"Unsupported file type: {file_type}")
+        text = self._extract_text(file_path, file_type)
         
         # Extract structured data
         return self._extract_structured_data(text)
     
+    def parse_batch(self, items: List[Tuple[str, str]], n_process: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Parse several resumes at once.
+        
+        Text extraction is I/O-bound and runs in a thread pool; NER then runs
+        through nlp.pipe, optionally across worker processes.
+        
+        Args:
+            items: (file_path, file_type) pairs
+            n_process: NER worker processes (default `settings.spacy_batch_processes`).
+                Always 1 on GPU, where forking a CUDA-initialised process is unsafe,
+                and inside daemonic processes such as Celery prefork workers,
+                which cannot start children.
+            
+        Returns:
+            Structured data for each resume, in input order
+        """
+        if not self.is_available():
+            raise ValueError("spaCy model not loaded. Run: python -m spacy download en_core_web_lg")
+        if not items:
+            return []
+        
+        with ThreadPoolExecutor() as executor:
+            texts = list(executor.map(lambda item: self._extract_text(*item), items))
+        
+        if n_process is None:
+            n_process = settings.spacy_batch_processes
+        if self.device == "gpu" or multiprocessing.current_process().daemon:
+            n_process = 1
+        n_process = max(1, min(n_process, len(texts)))
+        docs = self.nlp.pipe(texts, n_process=n_process, batch_size=8)
+        return [self._extract_structured_data(text, doc) for text, doc in zip(texts, docs)]
+    
+    def _extract_text(self, file_path: str, file_type: str) -> str:
+        """Extract raw text based on file type"""
+        if file_type == ".pdf":
+            return self._extract_pdf_text(file_path)
+        elif file_type == ".docx":
+            return self._extract_docx_text(file_path)
+        raise ValueError(f"Unsupported file type: {file_type}")
+    
     def _extract_pdf_text(self, file_path: str) -> str:
         """Extract text from PDF using PyMuPDF"""
-        text = ""
         try:
-            doc = fitz.open(file_path)
-            for page in doc:
-                text += page.get_text()
-            doc.close()
+            with fitz.open(file_path) as doc:
+                parts = [page.get_text("text") for page in doc]
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
-        return text
+        return "".join(parts)
     
     def _extract_docx_text(self, file_path: str) -> str:
         """Extract text from DOCX"""
         try:
             doc = Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+            text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
         except Exception as e:
             raise Exception(f"Error parsing DOCX: {str(e)}")
         return text
     
-    def _extract_structured_data(self, text: str) -> Dict[str, Any]:
-        """Extract structured data from resume text using NLP"""
-        doc = self.nlp(text)
+    def _extract_structured_data(self, text: str, doc=None) -> Dict[str, Any]:
+        """Extract structured data from resume text using NLP (reuses `doc` if already processed)"""
+        if doc is None:
+            doc = self.nlp(text)
+        
+        # Split, strip, lowercase and segment once; each extractor only walks its own span
+        lines = text.splitlines(keepends=True)
+        stripped = [line.strip() for line in lines]
+        lowered = [line.lower() for line in stripped]
+        sections = self._segment_sections(stripped, lowered)
+        
+        # NER runs once on the whole document; header parsing reads entities by line
+        entities = _EntityIndex(doc, lines)
         
         # Extract basic information
         parsed = {
-            "name": self._extract_name(doc),
+            "name": self._extract_name(doc, stripped),
             "email": self._extract_email(text),
             "phone": self._extract_phone(text),
             "location": "",  # SpaCy doesn't extract this reliably
-            "summary": self._extract_summary(text),
-            "experience": self._extract_experience(text),
-            "education": self._extract_education(text),
-            "skills": self._extract_skills(text),
-            "certifications": self._extract_certifications(text),
+            "summary": self._extract_summary(stripped, lowered, sections.get("summary")),
+            "experience": self._extract_experience(stripped, lowered, sections.get("experience"), entities),
+            "education": self._extract_education(stripped, lowered, sections.get("education"), entities),
+            "skills": self._extract_skills(stripped, lowered, sections.get("skills")),
+            "certifications": self._extract_certifications(stripped, lowered, sections.get("certifications")),
             "languages": [],  # Not implemented in basic version
             "raw_text": text,
             "metadata": {
                 "parser": "spacy",
-                "model": "en_core_web_lg" if "lg" in self.nlp.meta.get("name", "") else "en_core_web_sm"
+                "model": self._model_short,
+                "pipeline": list(self.nlp.pipe_names),
+                "device": self.device
             }
         }
         
         return parsed
     
-    def _extract_name(self, doc) -> str:
+    def _segment_sections(self, lines: List[str], lines_lower: List[str]) -> Dict[str, Tuple[int, int]]:
+        """
+        Locate each section in a single pass over the stripped lines.
+        
+        A section starts after the first line containing one of its keywords and
+        ends at the next section header that doesn't contain one. Returns
+        {section_name: (start, end)} line ranges for the sections found.
+        """
+        spans: Dict[str, Tuple[int, int]] = {}
+        starts: Dict[str, int] = {}
+        
+        for i, line in enumerate(lines):
+            if len(spans) == len(_SECTION_KEYWORDS):
+                break
+            
+            categories = _keyword_categories(lines_lower[i])
+            is_header = None
+            
+            for name in _SECTION_KEYWORDS:
+                if name in spans:
+                    continue
+                
+                if name in categories:
+                    starts.setdefault(name, i + 1)
+                    continue
+                
+                # Stop at next section
+                if name in starts:
+                    if is_header is None:
+                        is_header = self._is_section_header(line, lines_lower[i])
+                    if is_header:
+                        spans[name] = (starts.pop(name), i)
+        
+        for name, start in starts.items():
+            spans[name] = (start, len(lines))
+        
+        return spans
+    
+    def _extract_name(self, doc, lines: List[str]) -> str:
         """Extract name from document (usually first line or PERSON entity)"""
         # Try to find PERSON entities
         for ent in doc.ents:
             if ent.label_ == "PERSON":
                 return ent.text
         
-        # Fallback: first non-empty line
-        lines = doc.text.split("\n")
+        # Fallback: first non-empty (stripped) line
         for line in lines:
-            line = line.strip()
             if line and len(line) < 50:  # Names are usually short
                 return line
         
@@ -115,97 +415,85 @@ class SpacyResumeParser(BaseResumeParser):
     
     def _extract_email(self, text: str) -> str:
         """Extract email address"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
+        match = _EMAIL_RE.search(text)
         return match.group(0) if match else ""
     
     def _extract_phone(self, text: str) -> str:
         """Extract phone number"""
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        match = re.search(phone_pattern, text)
+        match = _PHONE_RE.search(text)
         return match.group(0) if match else ""
     
-    def _extract_summary(self, text: str) -> str:
-        """Extract professional summary/objective"""
-        summary_keywords = [
-            "summary", "objective", "profile", "about",
-            "professional summary", "career objective"
-        ]
+    def _extract_summary(
+        self,
+        lines: List[str],
+        lines_lower: List[str],
+        span: Optional[Tuple[int, int]]
+    ) -> str:
+        """Extract professional summary/objective from stripped lines"""
+        if not span:
+            return ""
         
-        lines = text.split("\n")
         summary_lines = []
-        capturing = False
         
-        for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
+        for i in range(*span):
+            line = lines[i]
             
-            # Check if this line is a summary header
-            if any(keyword in line_lower for keyword in summary_keywords):
-                capturing = True
+            # Skip repeated summary headers
+            if "summary" in _keyword_categories(lines_lower[i]):
                 continue
             
-            # Stop capturing at next section
-            if capturing:
-                if self._is_section_header(line):
-                    break
-                if line.strip():
-                    summary_lines.append(line.strip())
+            if line:
+                summary_lines.append(line)
         
         return " ".join(summary_lines)
     
-    def _extract_experience(self, text: str) -> List[Dict[str, Any]]:
-        """Extract work experience with enhanced NLP"""
+    def _extract_experience(
+        self,
+        lines: List[str],
+        lines_lower: List[str],
+        span: Optional[Tuple[int, int]],
+        entities: _EntityIndex
+    ) -> List[Dict[str, Any]]:
+        """Extract work experience with enhanced NLP from stripped lines"""
         experience = []
-        experience_keywords = ["experience", "work history", "employment", "work experience", "professional experience"]
+        if not span:
+            return experience
         
-        lines = text.split("\n")
-        capturing = False
         current_entry = None
         description_lines = []
         
-        for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
+        for i in range(*span):
+            line = lines[i]
             
-            # Start capturing after experience header
-            if any(keyword in line_lower for keyword in experience_keywords):
-                capturing = True
+            # Skip repeated experience headers
+            if "experience" in _keyword_categories(lines_lower[i]):
                 continue
             
-            if capturing:
-                # Stop at next major section
-                if self._is_section_header(line) and not any(k in line_lower for k in experience_keywords):
-                    # Save last entry
-                    if current_entry:
-                        current_entry["description"] = " ".join(description_lines).strip()
-                        current_entry["highlights"] = self._extract_bullet_points(description_lines)
-                        experience.append(current_entry)
-                    break
-                
-                if not line.strip():
-                    # Empty line often separates entries
-                    if current_entry and description_lines:
-                        current_entry["description"] = " ".join(description_lines).strip()
-                        current_entry["highlights"] = self._extract_bullet_points(description_lines)
-                        experience.append(current_entry)
-                        current_entry = None
-                        description_lines = []
-                    continue
+            if not line:
+                # Empty line often separates entries
+                if current_entry and description_lines:
+                    current_entry["description"] = " ".join(description_lines).strip()
+                    current_entry["highlights"] = self._extract_bullet_points(description_lines)
+                    experience.append(current_entry)
+                    current_entry = None
+                    description_lines = []
+                continue
+            
+            # Try to detect if this is a new job entry (title/company line)
+            if self._looks_like_job_header(line):
+                # Save previous entry
+                if current_entry:
+                    current_entry["description"] = " ".join(description_lines).strip()
+                    current_entry["highlights"] = self._extract_bullet_points(description_lines)
+                    experience.append(current_entry)
+                    description_lines = []
                 
-                # Try to detect if this is a new job entry (title/company line)
-                if self._looks_like_job_header(line):
-                    # Save previous entry
-                    if current_entry:
-                        current_entry["description"] = " ".join(description_lines).strip()
-                        current_entry["highlights"] = self._extract_bullet_points(description_lines)
-                        experience.append(current_entry)
-                        description_lines = []
-                    
-                    # Parse the new entry
-                    current_entry = self._parse_job_header(line, lines[i:i+3] if i+3 < len(lines) else lines[i:])
-                else:
-                    # This is description/bullet content
-                    if current_entry:
-                        description_lines.append(line.strip())
+                # Parse the new entry
+                current_entry = self._parse_job_header(lines, i, entities)
+            else:
+                # This is description/bullet content
+                if current_entry:
+                    description_lines.append(line)
         
         # Save last entry
         if current_entry:
@@ -222,7 +510,7 @@ class SpacyResumeParser(BaseResumeParser):
             return False
         
         # Check for date patterns (strong indicator)
-        if re.search(r'\d{4}', line):
+        if _DIGITS4_RE.search(line):
             return True
         
         # Check for pipe separator (Title | Company)
@@ -230,20 +518,29 @@ class SpacyResumeParser(BaseResumeParser):
             return True
         
         # Check for "at Company" pattern
-        if re.search(r'\bat\b', line.lower()):
+        if _AT_WORD_RE.search(line):
             return True
         
-        # Title case and short (likely a header)
+        # Title case and short (likely a header): at least 60% capitalized words,
+        # stopping as soon as the outcome is settled
         words = line.split()
-        if 2 <= len(words) <= 8:
-            if sum(1 for w in words if w[0].isupper()) >= len(words) * 0.6:
-                return True
+        n = len(words)
+        if 2 <= n <= 8:
+            need = (n * 6 + 9) // 10  # ceil(0.6 * n) in integer arithmetic
+            caps = 0
+            for i, w in enumerate(words):
+                if w and w[0].isupper():
+                    caps += 1
+                    if caps >= need:
+                        return True
+                elif caps + (n - i - 1) < need:
+                    return False
         
         return False
     
-    def _parse_job_header(self, header_line: str, context_lines: List[str]) -> Dict[str, Any]:
-        """Parse job title, company, dates, location from header and context"""
-        doc = self.nlp(header_line)
+    def _parse_job_header(self, lines: List[str], index: int, entities: _EntityIndex) -> Dict[str, Any]:
+        """Parse job title, company, dates, location from header line `index` and context"""
+        header_line = lines[index]
         
         # Initialize entry
         entry = {
@@ -266,7 +563,7 @@ class SpacyResumeParser(BaseResumeParser):
             entry["end_date"] = "Present"
         
         # Extract organizations (companies)
-        orgs = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
+        orgs = entities.in_line(index, ("ORG",))
         
         # Common patterns: "Title at Company" or "Title | Company" or "Company - Title"
         # Try to split by separators
@@ -274,13 +571,13 @@ class SpacyResumeParser(BaseResumeParser):
         parts = [header_line]
         for sep in separators:
             if sep in header_line:
-                parts = [p.strip() for p in re.split(re.escape(sep), header_line, maxsplit=1)]
+                parts = [p.strip() for p in header_line.split(sep, 1)]
                 break
         
         # Extract location from header or next line
-        location = self._extract_location_from_text(header_line)
-        if not location and len(context_lines) > 1:
-            location = self._extract_location_from_text(context_lines[1])
+        location = self._extract_location_from_line(lines, index, entities)
+        if not location and index + 1 < len(lines):
+            location = self._extract_location_from_line(lines, index + 1, entities)
         entry["location"] = location
         
         # If we found orgs, use them
@@ -309,32 +606,21 @@ class SpacyResumeParser(BaseResumeParser):
         """Extract date strings from text"""
         dates = []
         
-        # Common date patterns
-        date_patterns = [
-            r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\b',  # Jan 2020
-            r'\b\d{1,2}/\d{4}\b',  # 01/2020
-            r'\b\d{4}\b',  # 2020
-            r'\bPresent\b',
-            r'\bCurrent\b',
-            r'\bOngoing\b',
-            r'\bNow\b',
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            dates.extend(matches)
-        
-        # Normalize "Current", "Now", etc. to "Present"
-        dates = [d if d.lower() not in ['current', 'ongoing', 'now'] else 'Present' for d in dates]
+        for match in _DATES_RE.finditer(text):
+            token = match.group(0)
+            # Normalize "Current", "Now", etc. to "Present"
+            dates.append("Present" if token.lower() in _PRESENT_WORDS else token)
+            if len(dates) == 2:
+                break
         
-        return dates[:2]  # Return max 2 dates (start, end)
+        return dates  # Max 2 dates (start, end)
     
-    def _extract_location_from_text(self, text: str) -> str:
-        """Extract location (City, State/Country) from text"""
-        doc = self.nlp(text)
+    def _extract_location_from_line(self, lines: List[str], index: int, entities: _EntityIndex) -> str:
+        """Extract location (City, State/Country) from line `index`"""
+        text = lines[index]
         
         # Look for GPE (Geo-Political Entity) entities
-        locations = [ent.text for ent in doc.ents if ent.label_ in ["GPE", "LOC"]]
+        locations = entities.in_line(index, ("GPE", "LOC"))
         
         if locations:
             # Often format is "City, State" or "City, Country"
@@ -343,8 +629,7 @@ class SpacyResumeParser(BaseResumeParser):
             return locations[0]
         
         # Fallback: look for common location patterns
-        location_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),\s*([A-Z]{2}|[A-Z][a-z]+)\b'
-        match = re.search(location_pattern, text)
+        match = _LOCATION_RE.search(text)
         if match:
             return match.group(0)
         
@@ -352,17 +637,12 @@ class SpacyResumeParser(BaseResumeParser):
     
     def _remove_dates_and_location(self, text: str) -> str:
         """Remove date and location patterns from text"""
-        # Remove dates
-        text = re.sub(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\b', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'\b\d{1,2}/\d{4}\b', '', text)
-        text = re.sub(r'\b\d{4}\b', '', text)
-        text = re.sub(r'\b(?:Present|Current|Ongoing|Now)\b', '', text, flags=re.IGNORECASE)
-        
-        # Remove location patterns
-        text = re.sub(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),\s*([A-Z]{2}|[A-Z][a-z]+)\b', '', text)
+        # Remove dates, then location patterns
+        text = _JOB_NOISE_RE.sub('', text)
+        text = _LOCATION_RE.sub('', text)
         
         # Remove date separators
-        text = re.sub(r'\s*[-–—]\s*', ' ', text)
+        text = _DATE_SEP_RE.sub(' ', text)
         
         # Clean up extra whitespace
         text = ' '.join(text.split())
@@ -374,60 +654,56 @@ class SpacyResumeParser(BaseResumeParser):
         bullets = []
         for line in lines:
             line = line.strip()
-            # Check if line starts with bullet marker
-            if re.match(r'^[•·∙▪▫◦‣⁃○●★☆♦◆■□-]\s+', line) or line.startswith('- '):
+            # Check if line starts with bullet marker ("- " is covered by the class)
+            match = _BULLET_RE.match(line)
+            if match:
                 # Remove bullet marker
-                bullet = re.sub(r'^[•·∙▪▫◦‣⁃○●★☆♦◆■□-]\s+', '', line)
+                bullet = line[match.end():]
                 if bullet:
                     bullets.append(bullet)
         
         return bullets
     
-    def _extract_education(self, text: str) -> List[Dict[str, Any]]:
-        """Extract education with enhanced parsing"""
+    def _extract_education(
+        self,
+        lines: List[str],
+        lines_lower: List[str],
+        span: Optional[Tuple[int, int]],
+        entities: _EntityIndex
+    ) -> List[Dict[str, Any]]:
+        """Extract education with enhanced parsing from stripped lines"""
         education = []
-        education_keywords = ["education", "academic", "qualification", "academic background"]
+        if not span:
+            return education
         
-        lines = text.split("\n")
-        capturing = False
         current_entry = None
-        entry_lines = []
         
-        for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
+        for i in range(*span):
+            line = lines[i]
             
-            if any(keyword in line_lower for keyword in education_keywords):
-                capturing = True
+            # Skip repeated education headers
+            if "education" in _keyword_categories(lines_lower[i]):
                 continue
             
-            if capturing:
-                if self._is_section_header(line) and not any(k in line_lower for k in education_keywords):
-                    # Save last entry
-                    if current_entry:
-                        education.append(current_entry)
-                    break
-                
-                if not line.strip():
-                    # Empty line separates entries
-                    if current_entry:
-                        education.append(current_entry)
-                        current_entry = None
-                        entry_lines = []
-                    continue
+            if not line:
+                # Empty line separates entries
+                if current_entry:
+                    education.append(current_entry)
+                    current_entry = None
+                continue
+            
+            # Check if this looks like a new education entry (degree or institution)
+            if self._looks_like_education_header(line):
+                # Save previous entry
+                if current_entry:
+                    education.append(current_entry)
                 
-                # Check if this looks like a new education entry (degree or institution)
-                if self._looks_like_education_header(line):
-                    # Save previous entry
-                    if current_entry:
-                        education.append(current_entry)
-                        entry_lines = []
-                    
-                    # Start new entry
-                    current_entry = self._parse_education_entry(line, lines[i:i+3] if i+3 < len(lines) else lines[i:])
-                else:
-                    # Additional info for current entry (GPA, minor, etc.)
-                    if current_entry:
-                        self._enhance_education_entry(current_entry, line)
+                # Start new entry
+                current_entry = self._parse_education_entry(lines, i, entities)
+            else:
+                # Additional info for current entry (GPA, minor, etc.)
+                if current_entry:
+                    self._enhance_education_entry(current_entry, line)
         
         # Save last entry
         if current_entry:
@@ -441,26 +717,20 @@ class SpacyResumeParser(BaseResumeParser):
         if not line or len(line) > 150:
             return False
         
-        # Check for degree keywords
-        degree_keywords = ['bachelor', 'master', 'phd', 'ph.d', 'b.s.', 'b.a.', 'm.s.', 'm.a.',
-                          'associate', 'diploma', 'certificate', 'degree', 'bs', 'ba', 'ms', 'ma']
-        if any(keyword in line.lower() for keyword in degree_keywords):
-            return True
-        
-        # Check for university/college keywords
-        institution_keywords = ['university', 'college', 'institute', 'school']
-        if any(keyword in line.lower() for keyword in institution_keywords):
+        # Check for degree or university/college keywords
+        categories = _keyword_categories(line.lower())
+        if "degree" in categories or "institution" in categories:
             return True
         
         # Check for date patterns (graduation year)
-        if re.search(r'\b\d{4}\b', line):
+        if _DATE_YEAR_RE.search(line):
             return True
         
         return False
     
-    def _parse_education_entry(self, header_line: str, context_lines: List[str]) -> Dict[str, Any]:
-        """Parse degree, institution, dates, GPA, major"""
-        doc = self.nlp(header_line)
+    def _parse_education_entry(self, lines: List[str], index: int, entities: _EntityIndex) -> Dict[str, Any]:
+        """Parse degree, institution, dates, GPA, major from line `index` and context"""
+        header_line = lines[index]
         
         entry = {
             "degree": "",
@@ -471,7 +741,7 @@ class SpacyResumeParser(BaseResumeParser):
         }
         
         # Extract organizations (likely institution)
-        orgs = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
+        orgs = entities.in_line(index, ("ORG",))
         if orgs:
             entry["institution"] = orgs[0]
         
@@ -486,13 +756,9 @@ class SpacyResumeParser(BaseResumeParser):
             entry["gpa"] = gpa
         
         # Determine if line is degree or institution
-        degree_keywords = ['bachelor', 'master', 'phd', 'ph.d', 'b.s.', 'b.a.', 'm.s.', 'm.a.',
-                          'associate', 'diploma', 'certificate', 'degree', 'bs', 'ba', 'ms', 'ma']
-        institution_keywords = ['university', 'college', 'institute', 'school']
-        
-        line_lower = header_line.lower()
-        has_degree = any(keyword in line_lower for keyword in degree_keywords)
-        has_institution = any(keyword in line_lower for keyword in institution_keywords)
+        categories = _keyword_categories(header_line.lower())
+        has_degree = "degree" in categories
+        has_institution = "institution" in categories
         
         if has_degree:
             # This line is the degree
@@ -500,13 +766,12 @@ class SpacyResumeParser(BaseResumeParser):
             entry["major"] = self._extract_major(header_line)
             
             # Look for institution in next line
-            if not entry["institution"] and len(context_lines) > 1:
-                next_line = context_lines[1].strip()
-                next_doc = self.nlp(next_line)
-                next_orgs = [ent.text for ent in next_doc.ents if ent.label_ == "ORG"]
+            if not entry["institution"] and index + 1 < len(lines):
+                next_line = lines[index + 1].strip()
+                next_orgs = entities.in_line(index + 1, ("ORG",))
                 if next_orgs:
                     entry["institution"] = next_orgs[0]
-                elif any(k in next_line.lower() for k in institution_keywords):
+                elif "institution" in _keyword_categories(next_line.lower()):
                     entry["institution"] = self._clean_education_field(next_line)
         
         elif has_institution:
@@ -514,9 +779,9 @@ class SpacyResumeParser(BaseResumeParser):
             entry["institution"] = self._clean_education_field(header_line)
             
             # Look for degree in next line
-            if not entry["degree"] and len(context_lines) > 1:
-                next_line = context_lines[1].strip()
-                if any(k in next_line.lower() for k in degree_keywords):
+            if not entry["degree"] and index + 1 < len(lines):
+                next_line = lines[index + 1].strip()
+                if "degree" in _keyword_categories(next_line.lower()):
                     entry["degree"] = self._clean_education_field(next_line)
                     entry["major"] = self._extract_major(next_line)
         
@@ -524,17 +789,10 @@ class SpacyResumeParser(BaseResumeParser):
     
     def _extract_gpa(self, text: str) -> str:
         """Extract GPA from text"""
-        # Common GPA patterns
-        gpa_patterns = [
-            r'GPA:?\s*(\d+\.\d+)\s*(?:/\s*(\d+\.\d+))?',
-            r'(\d+\.\d+)\s*/\s*(\d+\.\d+)\s+GPA',
-            r'(\d+\.\d+)\s+GPA',
-        ]
-        
-        for pattern in gpa_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _GPA_RES:
+            match = pattern.search(text)
             if match:
-                if match.group(2):  # Has scale (e.g., 3.8/4.0)
+                if match.re.groups > 1 and match.group(2):  # Has scale (e.g., 3.8/4.0)
                     return f"{match.group(1)}/{match.group(2)}"
                 else:
                     return match.group(1)
@@ -543,18 +801,12 @@ class SpacyResumeParser(BaseResumeParser):
     
     def _extract_major(self, text: str) -> str:
         """Extract major/field of study from text"""
-        major_patterns = [
-            r'(?:major|concentration|specialization|field):\s*([^,\n]+)',
-            r'\bin\s+([A-Z][^,\n]{2,50})',  # "Bachelor in Computer Science"
-            r'of\s+([A-Z][^,\n]{2,50})',  # "Bachelor of Science"
-        ]
-        
-        for pattern in major_patterns:
-            match = re.search(pattern, text)
+        for pattern in _MAJOR_RES:
+            match = pattern.search(text)
             if match:
                 major = match.group(1).strip()
                 # Clean up common trailing words
-                major = re.sub(r'\s*(?:from|at|,).*$', '', major)
+                major = _MAJOR_TRAILER_RE.sub('', major)
                 if len(major) < 50:  # Sanity check
                     return major
         
@@ -562,21 +814,12 @@ class SpacyResumeParser(BaseResumeParser):
     
     def _clean_education_field(self, text: str) -> str:
         """Clean education field by removing dates, GPA, etc."""
-        # Remove GPA
-        text = re.sub(r'GPA:?\s*\d+\.\d+(?:\s*/\s*\d+\.\d+)?', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'\d+\.\d+\s*/\s*\d+\.\d+\s+GPA', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'\d+\.\d+\s+GPA', '', text, flags=re.IGNORECASE)
-        
-        # Remove dates
-        text = re.sub(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\b', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'\b\d{1,2}/\d{4}\b', '', text)
-        text = re.sub(r'\b\d{4}\b', '', text)
-        
-        # Remove location
-        text = re.sub(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),\s*([A-Z]{2}|[A-Z][a-z]+)\b', '', text)
+        # Remove GPA and dates, then location
+        text = _EDUCATION_NOISE_RE.sub('', text)
+        text = _LOCATION_RE.sub('', text)
         
         # Remove date separators
-        text = re.sub(r'\s*[-–—]\s*', ' ', text)
+        text = _DATE_SEP_RE.sub(' ', text)
         
         # Clean up extra whitespace
         text = ' '.join(text.split())
@@ -603,37 +846,35 @@ class SpacyResumeParser(BaseResumeParser):
             if dates:
                 entry["graduation_date"] = dates[0] if dates[0].lower() != 'present' else dates[-1]
     
-    def _extract_skills(self, text: str) -> List[str]:
-        """Extract skills"""
-        skills = []
-        skills_keywords = ["skills", "technical skills", "competencies", "expertise", "technologies"]
-        
-        lines = text.split("\n")
-        capturing = False
-        
-        for line in lines:
-            line_lower = line.lower().strip()
+    def _extract_skills(
+        self,
+        lines: List[str],
+        lines_lower: List[str],
+        span: Optional[Tuple[int, int]]
+    ) -> List[str]:
+        """Extract skills from stripped lines"""
+        # Dict keys give order-preserving dedup; repeated skills skip the heuristic
+        skills: Dict[str, None] = {}
+        if not span:
+            return []
+        
+        for i in range(*span):
+            line = lines[i]
             
-            # Start capturing after skills header
-            if any(keyword in line_lower for keyword in skills_keywords):
-                capturing = True
+            # Skip repeated skills headers
+            if "skills" in _keyword_categories(lines_lower[i]):
                 continue
             
-            if capturing:
-                # Stop at next section
-                if self._is_section_header(line):
-                    break
-                
-                if line.strip():
-                    # Split by common delimiters
-                    line_skills = re.split(r'[,;|•·]', line)
-                    for skill in line_skills:
-                        skill = skill.strip()
-                        # Filter out obvious non-skills
-                        if skill and self._is_likely_skill(skill):
-                            skills.append(skill)
-        
-        return list(set(skills))  # Remove duplicates
+            if line:
+                # Split by common delimiters
+                line_skills = _SKILL_SPLIT_RE.split(line)
+                for skill in line_skills:
+                    skill = skill.strip()
+                    # Filter out obvious non-skills
+                    if skill and skill not in skills and self._is_likely_skill(skill):
+                        skills[skill] = None
+        
+        return list(skills)
     
     def _is_likely_skill(self, text: str) -> bool:
         """Heuristic to determine if text is likely a skill"""
@@ -643,82 +884,59 @@ class SpacyResumeParser(BaseResumeParser):
         if len(text) > 50:
             return False
         
-        # Filter out common non-skill patterns
-        non_skill_patterns = [
-            r'^\d{4}$',  # Just a year
-            r'^\d{1,2}/\d{1,2}/\d{2,4}$',  # Date
-            r'^[A-Z][a-z]+ \d{4}$',  # "January 2020"
-            r'university$',  # School names
-            r'college$',
-            r'school$',
-            r'^GPA',  # GPA entries
-        ]
-        
+        # Filter out common non-skill words before any regex work
         text_lower = text.lower()
-        for pattern in non_skill_patterns:
-            if re.search(pattern, text_lower):
-                return False
-        
-        # Filter out common non-skill words
-        non_skills = ['present', 'current', 'ongoing', 'volunteer', 'member', 'president', 'vice president']
-        if text_lower in non_skills:
+        if text_lower in _NON_SKILL_WORDS:
             return False
         
-        return True
+        # Filter out common non-skill patterns
+        return _NON_SKILL_RE.search(text_lower) is None
     
-    def _extract_certifications(self, text: str) -> List[Dict[str, str]]:
-        """Extract certifications"""
+    def _extract_certifications(
+        self,
+        lines: List[str],
+        lines_lower: List[str],
+        span: Optional[Tuple[int, int]]
+    ) -> List[Dict[str, str]]:
+        """Extract certifications from stripped lines"""
         certifications = []
-        cert_keywords = ["certification", "certificate", "license"]
-        
-        lines = text.split("\n")
-        capturing = False
+        if not span:
+            return certifications
         
-        for line in lines:
-            line_lower = line.lower().strip()
+        for i in range(*span):
+            line = lines[i]
             
-            if any(keyword in line_lower for keyword in cert_keywords):
-                capturing = True
+            # Skip repeated certification headers
+            if "certifications" in _keyword_categories(lines_lower[i]):
                 continue
             
-            if capturing:
-                if self._is_section_header(line):
-                    break
-                
-                if line.strip():
-                    certifications.append({
-                        "name": line.strip(),
-                        "issuer": "",
-                        "date": ""
-                    })
+            if line:
+                certifications.append({
+                    "name": line,
+                    "issuer": "",
+                    "date": ""
+                })
         
         return certifications
     
-    def _is_section_header(self, line: str) -> bool:
-        """Check if line is likely a section header"""
-        line = line.strip()
+    def _is_section_header(self, line: str, line_lower: Optional[str] = None) -> bool:
+        """
+        Check if line is likely a section header.
+        
+        Callers that already hold the stripped, lowercased line can pass it
+        as ``line_lower`` to avoid recomputing it.
+        """
+        if line_lower is None:
+            line = line.strip()
+            line_lower = line.lower()
         if not line:
             return False
         
-        # Common section headers (expanded list)
-        headers = [
-            "summary", "objective", "experience", "education", "skills", "relevant experience",
-            "certifications", "projects", "awards", "publications",
-            "volunteer", "languages", "interests", "references",
-            "activities", "extracurricular", "leadership", "involvement",
-            "honors", "achievements", "professional development",
-            "training", "courses", "portfolio", "research",
-            "teaching", "speaking", "presentations", "patents",
-            "memberships", "affiliations", "community service"
-        ]
-        
-        line_lower = line.lower()
-        
-        # Check for exact header match
-        for header in headers:
-            pattern = rf"^\s*{re.escape(header)}\s*:?\s*$"
-            if re.match(pattern, line_lower):
-                return True
+        # Check for exact header match (optionally followed by a colon)
+        if line_lower.endswith(':'):
+            line_lower = line_lower[:-1].rstrip()
+        if line_lower in _SECTION_HEADERS:
+            return True
         
         # Additional heuristics for section headers:
         # - All caps (e.g., "EDUCATION")
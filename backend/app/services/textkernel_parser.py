@@ -2,19 +2,285 @@
 Affinda Parser Adapter - Commercial-grade resume parsing via Affinda API.
 
 Affinda provides highly accurate parsing with minimal R&D effort.
-This adapter wraps the Affinda API (using their Python SDK) and converts to our standard format.
+This adapter wraps the Affinda REST API and converts to our standard format.
 parser that retrieves data from a resume like a companu would, this is the truth of the ats tool
 """
 
 import os
 import time
-from typing import Dict, Any, List, Optional
+import logging
+import random
+import asyncio
+import hashlib
+import hmac
+import json
+import re
+import threading
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, BinaryIO, AsyncIterator
 from app.services.base_parser import BaseResumeParser
 from app.config import settings
 from pathlib import Path
-from affinda import AffindaAPI, TokenCredential
-import tempfile
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
+import redis
+from redis import asyncio as aioredis
+
+try:
+    import orjson  # Optional: faster decoding of large Affinda payloads
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: streams the upload body instead of building it in memory
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+
+logger = logging.getLogger(__name__)
+
+# Upload and status polls share one host so they share pooled connections
+_API_BASE = f"https://api.{settings.affinda_region}.affinda.com/v3"
+_DOCUMENTS_URL = f"{_API_BASE}/documents"
+
+# Magic bytes of the accepted upload formats (a DOCX is a ZIP container)
+_PDF_MAGIC = b"%PDF-"
+_DOCX_MAGIC = b"PK\x03\x04"
+_PDF_MIME = "application/pdf"
+_DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Document status polling: exponential backoff with jitter, bounded by a total wait (seconds)
+_MAX_WAIT_TIME = 60
+_INITIAL_POLL_INTERVAL = 0.25
+_MAX_POLL_INTERVAL = 4.0
+# With a callbackUrl, how long (seconds) to wait for Affinda's callback before
+# falling back to polling for the rest of _MAX_WAIT_TIME
+_CALLBACK_WAIT = 45
+
+# Keys that mean the resume data was returned at the top level rather than under 'data'
+_TOP_LEVEL_RESUME_KEYS = ('name', 'emails', 'workExperience', 'work_experience', 'education')
+_RAW_PARSED = ("raw", "parsed")
+
+# Letters, spaces and hyphens only, with at least one letter
+_NAME_LINE_RE = re.compile(r"[ -]*[^\W\d_](?:[^\W\d_]|[ -])*")
+
+# Top-level resume fields; Affinda has used both singular and plural names
+_SECTION_ALIASES = {
+    "name": ("candidateName", "name"),
+    "email": ("email", "emails"),
+    "phone": ("phoneNumber", "phone", "phoneNumbers", "phone_numbers"),
+    "summary": ("summary", "summaryText"),
+    "experience": ("workExperience", "work_experience"),
+    "skills": ("skill", "skills"),
+    "languages": ("language", "languages"),
+    "projects": ("project", "projects"),
+    "achievements": ("achievement", "achievements"),
+    "associations": ("association", "associations"),
+    "raw_text": ("rawText", "raw_text"),
+    "detected_language": ("detectedLanguage", "detected_language"),
+}
+
+# Affinda prefixes most section fields (workExperienceJobTitle, educationGrade, ...)
+# but older extractors and custom workspaces use the bare names; aliases are
+# tried in order.
+_EXP_FIELDS = {
+    "title": ("workExperienceJobTitle", "jobTitle", "job_title", "title"),
+    "company": ("workExperienceOrganization", "organization", "company", "employer"),
+    "location": ("workExperienceLocation", "location"),
+    "description": ("workExperienceDescription", "description", "summary"),
+    "achievements": ("achievements", "highlights", "responsibilities"),
+}
+_EDU_FIELDS = {
+    "degree": ("educationAccreditation", "educationLevel", "degree", "accreditation", "qualification"),
+    "institution": ("educationOrganization", "organization", "institution", "school", "university"),
+    "gpa": ("educationGrade", "gpa"),
+    "major": ("educationMajor", "major"),
+}
+# Projects and achievements share the same name/description aliases
+_ITEM_FIELDS = {
+    "name": ("name", "title"),
+    "description": ("description", "summary"),
+}
+_ASSOC_FIELDS = {
+    "name": ("name", "organization"),
+    "role": ("role", "position"),
+}
+_LANGUAGE_KEYS = ("name", "value")
+
+def _loads(content: bytes) -> Any:
+    """Decode a JSON body, with orjson when installed"""
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a JSON body, with orjson when installed"""
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
+
+
+def _pick(d: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """First truthy value among `keys` in `d`, or None."""
+    for key in keys:
+        value = d.get(key)
+        if value:
+            return value
+    return None
+
+
+def _val(obj: Any, *keys: str) -> str:
+    """
+    Text of an Affinda field value.
+    
+    Fields arrive as plain values, {raw, parsed} dicts (where parsed may nest
+    another dict), or lists of either; lists yield their first item. Dicts are
+    searched by `keys`, defaulting to raw then parsed.
+    """
+    if type(obj) is list:
+        obj = obj[0] if obj else None
+    if type(obj) is dict:
+        for key in keys or _RAW_PARSED:
+            value = obj.get(key)
+            if value:
+                return _val(value)
+        return ""
+    if type(obj) is str:
+        return obj
+    return str(obj) if obj else ""
+
+
+def _item_fields(item: Dict[str, Any], name_keys: Tuple[str, ...], detail_keys: Tuple[str, ...]) -> Tuple[Any, Any]:
+    """
+    (name, detail) of a project/achievement/association entry.
+    
+    Fields are read from the entry's 'parsed' dict, or from the entry itself
+    when 'parsed' is present but not a dict; the name falls back to 'raw'.
+    """
+    parsed = item.get("parsed", {})
+    src = parsed if type(parsed) is dict else item
+    return _pick(src, name_keys) or item.get("raw", ""), _pick(src, detail_keys)
+
+
+def _text(value: Any) -> str:
+    """Stripped text of a JSON scalar; strings skip the str() round trip"""
+    if type(value) is str:
+        return value.strip()
+    return str(value).strip()
+
+
+@lru_cache(maxsize=4096)
+def _format_date_str(date_str: str) -> str:
+    """YYYY-MM-DD from an Affinda date string; the same dates recur across a batch"""
+    # Already YYYY-MM-DD[...]: the date part is all we keep
+    if len(date_str) >= 10 and date_str[4] == '-' and date_str[7] == '-':
+        return date_str[:10]
+    # Try to parse ISO format date string
+    try:
+        # Handle ISO format with or without timezone
+        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        return dt.strftime("%Y-%m-%d")
+    except ValueError:
+        # If parsing fails, return as-is if it looks like a date
+        if len(date_str) >= 10:
+            return date_str[:10]  # Take first 10 chars (YYYY-MM-DD)
+        return date_str
+
+
+# Bytes read per worker-thread hop when streaming an async upload
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _multipart_stream(
+    fields: Dict[str, Any],
+    file_name: str,
+    file_obj: BinaryIO,
+    mime_type: str
+) -> Tuple[Dict[str, str], AsyncIterator[bytes]]:
+    """
+    Headers and body for a multipart/form-data upload whose file part is read in a
+    worker thread, chunk by chunk, so an async upload never blocks the event loop on
+    disk reads. The length is known up front, so the body is not sent chunked.
+    """
+    boundary = os.urandom(16).hex()
+    quoted_name = file_name.replace("\\", "\\\\").replace('"', "%22").replace("\r", "").replace("\n", "")
+    head = "".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+        for name, value in fields.items()
+    ) + (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{quoted_name}"\r\n'
+        f'Content-Type: {mime_type}\r\n\r\n'
+    )
+    head = head.encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+    size = os.fstat(file_obj.fileno()).st_size
+    
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        while chunk := await asyncio.to_thread(file_obj.read, _UPLOAD_CHUNK_SIZE):
+            yield chunk
+        yield tail
+    
+    headers = {
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+        "Content-Length": str(len(head) + size + len(tail)),
+    }
+    return headers, body()
+
+
+# Set by the Affinda webhook for a finished document, and the pub/sub channel that
+# wakes parses waiting on it; the flag covers a parse that subscribes after the publish
+_READY_KEY = "affinda:ready:{}"
+_READY_TTL = 300
+
+
+def _callback_url() -> Optional[str]:
+    """callbackUrl for async uploads, carrying the shared webhook token; None unless both are configured"""
+    if not (settings.affinda_callback_url and settings.affinda_webhook_secret):
+        return None
+    parts = urlsplit(settings.affinda_callback_url)
+    query = urlencode(parse_qsl(parts.query) + [("token", settings.affinda_webhook_secret)])
+    return urlunsplit(parts._replace(query=query))
+
+
+def webhook_token_valid(token: Optional[str]) -> bool:
+    """Whether a webhook delivery carries the configured shared token; always False without one"""
+    secret = settings.affinda_webhook_secret
+    return bool(secret) and token is not None and hmac.compare_digest(token.encode(), secret.encode())
+
+
+def webhook_document_identifier(body: Dict[str, Any]) -> Optional[str]:
+    """Document identifier of an Affinda webhook delivery (the document may be nested under 'payload')"""
+    document = body.get("payload") if isinstance(body.get("payload"), dict) else body
+    meta = document.get("meta")
+    identifier = (meta.get("identifier") if isinstance(meta, dict) else None) or document.get("identifier")
+    return identifier if isinstance(identifier, str) else None
+
+
+async def notify_document_ready(identifier: str) -> None:
+    """Wake any async parse waiting on `identifier`; called from the Affinda webhook route"""
+    key = _READY_KEY.format(identifier)
+    async with aioredis.Redis.from_url(settings.redis_url) as conn:
+        await conn.set(key, 1, ex=_READY_TTL)
+        await conn.publish(key, 1)
+
+
+# Part of every result cache key: bump whenever _convert_affinda_json_response output
+# changes, so results converted by older code stop being served
+_CACHE_VERSION = 3
+# After a Redis error, skip the result cache for this long (seconds) rather than
+# paying its socket timeouts on every parse while Redis is down
+_CACHE_RETRY_AFTER = 30.0
+
+# In-process LRU of (stored at, serialized result) in front of Redis, shared by all
+# parser instances; entries expire after affinda_cache_ttl like their Redis copies
+_RECENT_RESULTS: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+_RECENT_RESULTS_LOCK = threading.Lock()
+_RECENT_RESULTS_SIZE = 256
 
 
 class TextkernelParser(BaseResumeParser):
@@ -33,29 +299,40 @@ class TextkernelParser(BaseResumeParser):
         self.workspace_id = "gThVEtSq"
         self.timeout = 30.0
         self.document_type = "wbTlWoen"
-        # Debug logging
+        # Converted results keyed by file content hash, so re-uploads skip the API entirely
+        self._cache = redis.Redis.from_url(settings.redis_url, socket_connect_timeout=1, socket_timeout=1)
+        self._cache_down_until = 0.0
+        # One keep-alive session for the upload and every status poll; idempotent GETs
+        # retry on gateway errors, and the final response is still returned to the caller
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False)
+        )
+        self.session.mount("https://", adapter)
+        # Built once; the session sends it on every sync call and async calls pass it explicitly
+        self._headers = self._auth_headers() if self.api_key else {}
+        self.session.headers.update(self._headers)
+        # Credentials are fixed for the parser's lifetime, so availability is decided
+        # (and logged) once here rather than on every dispatch
+        self._available = bool(self.api_key) and bool(self.workspace_id)
         if not self.api_key:
-            print("[AFFINDA DEBUG] API key not found. Checked: AFFINDA_API_KEY env var")
+            logger.debug("API key not found. Checked: AFFINDA_API_KEY env var")
+            logger.info("Not available: API key missing")
         if not self.workspace_id:
-            print("[AFFINDA DEBUG] Workspace ID not found. Checked: AFFINDA_WORKSPACE_ID env var and settings.affinda_workspace_id")
+            logger.debug("Workspace ID not found. Checked: AFFINDA_WORKSPACE_ID env var and settings.affinda_workspace_id")
+            logger.info("Not available: Workspace ID missing")
         if self.api_key and self.workspace_id:
             api_key_preview = f"{self.api_key[:8]}...{self.api_key[-4:]}" if len(self.api_key) > 12 else "***"
-            print(f"[AFFINDA DEBUG] API key found (length: {len(self.api_key)}): {api_key_preview}, Workspace ID: {self.workspace_id[:10]}...")
+            logger.debug("API key found (length: %d): %s, Workspace ID: %s...", len(self.api_key), api_key_preview, self.workspace_id[:10])
     
     def get_parser_name(self) -> str:
         return "Affinda"
     
     def is_available(self) -> bool:
         """Check if Affinda API is configured"""
-        has_key = bool(self.api_key)
-        has_workspace = bool(self.workspace_id)
-        
-        if not has_key:
-            print("[AFFINDA] Not available: API key missing")
-        if not has_workspace:
-            print("[AFFINDA] Not available: Workspace ID missing")
-        
-        return has_key and has_workspace
+        return self._available
     
     def parse_to_structured_json(self, file_path: str, file_type: str) -> Dict[str, Any]:
         """
@@ -69,49 +346,283 @@ class TextkernelParser(BaseResumeParser):
         - Education normalization
         - Multi-language support
         """
+        self._check_configured()
+        
+        # Sniff the format locally so bad files fail fast without an API call, then hash
+        # in chunks; a cache hit never loads the whole file into memory
+        mime_type, cache_key = self._inspect_file(file_path)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.debug("Cache hit for %s", cache_key)
+            return cached
+        
+        # wait=True: the upload blocks until processing finishes, so on the happy path
+        # the poll loop below never runs
+        with open(file_path, "rb") as f:
+            files, data = self._upload_payload(file_path, f, mime_type, wait=True)
+            if MultipartEncoder is not None:
+                # Read the file onto the socket in chunks rather than buffering the whole body
+                body = MultipartEncoder(fields={**{k: str(v) for k, v in data.items()}, **files})
+                response = self.session.post(_DOCUMENTS_URL, data=body, headers={"Content-Type": body.content_type}, timeout=120)
+            else:
+                response = self.session.post(_DOCUMENTS_URL, files=files, data=data, timeout=120)
+        doc_response = self._check_upload_response(response)
+        get_url = f"{_DOCUMENTS_URL}/{self._document_identifier(doc_response)}"
+        
+        # Poll until the document is ready and its data populated
+        meta_ready = doc_response.get("meta", {}).get("ready", False)
+        logger.debug("Initial ready state from upload response: %s", meta_ready)
+        interval = _INITIAL_POLL_INTERVAL
+        start_time = last_debug = time.monotonic()
+        deadline = start_time + _MAX_WAIT_TIME
+        
+        while not (meta_ready and self._has_resume_data(doc_response)) and time.monotonic() < deadline:
+            time.sleep(interval * random.uniform(0.8, 1.2))
+            
+            # Get document status
+            get_response = self.session.get(get_url, timeout=30)
+            interval = min(interval * 2, _MAX_POLL_INTERVAL)
+            if get_response.status_code >= 500:
+                # Transient server error: retry, still backing off so a failing API isn't hammered
+                logger.debug("Transient error while polling: %s", get_response.status_code)
+                continue
+            if get_response.status_code != 200:
+                raise Exception(f"Failed to get document status: {get_response.status_code} - {get_response.text}")
+            
+            doc_response = _loads(get_response.content)
+            meta_ready, last_debug = self._check_poll_response(doc_response, start_time, last_debug)
+        
+        return self._finish(doc_response, meta_ready, cache_key)
+    
+    async def parse_to_structured_json_async(
+        self,
+        file_path: str,
+        file_type: str,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of parse_to_structured_json.
+        
+        Uploads with httpx.AsyncClient and then waits for Affinda's callback when
+        AFFINDA_CALLBACK_URL is set, or polls with asyncio.sleep otherwise, so an event
+        loop can multiplex many parses instead of a worker blocking for the whole wait.
+        Pass `client` to share one connection pool across parses.
+        """
+        if client is None:
+            async with self._async_client() as client:
+                return await self.parse_to_structured_json_async(file_path, file_type, client)
+        
+        self._check_configured()
+        
+        mime_type, cache_key = await asyncio.to_thread(self._inspect_file, file_path)
+        cached = await asyncio.to_thread(self._cache_get, cache_key)
+        if cached is not None:
+            logger.debug("Cache hit for %s", cache_key)
+            return cached
+        
+        headers = self._headers
+        # No server-side wait: it frees the connection (and Affinda's worker) instead of
+        # holding both for the whole parse. With a callback URL configured, Affinda POSTs
+        # to our webhook once the document is processed; otherwise we poll
+        callback_url = _callback_url()
+        # The multipart body is streamed, with file reads (and the open) in worker threads
+        f = await asyncio.to_thread(open, file_path, "rb")
+        try:
+            files, data = self._upload_payload(file_path, f, mime_type, wait=False, callback_url=callback_url)
+            file_name, _, _ = files["file"]
+            # Form values encoded as httpx would ("wait" -> "false")
+            fields = {k: str(v).lower() if isinstance(v, bool) else v for k, v in data.items()}
+            body_headers, body = _multipart_stream(fields, file_name, f, mime_type)
+            response = await client.post(_DOCUMENTS_URL, headers={**headers, **body_headers}, content=body)
+        finally:
+            f.close()
+        doc_response = self._check_upload_response(response)
+        doc_identifier = self._document_identifier(doc_response)
+        get_url = f"{_DOCUMENTS_URL}/{doc_identifier}"
+        
+        # Poll until the document is ready and its data populated
+        meta_ready = doc_response.get("meta", {}).get("ready", False)
+        logger.debug("Initial ready state from upload response: %s", meta_ready)
+        interval = _INITIAL_POLL_INTERVAL
+        start_time = last_debug = time.monotonic()
+        deadline = start_time + _MAX_WAIT_TIME
+        
+        # One subscription per parse: wait on it for the callback, and keep using it to
+        # wake early from each backoff sleep if polling takes over
+        subscription = self._ready_subscription(doc_identifier) if callback_url else nullcontext()
+        async with subscription as wait_ready:
+            fetch_now = False
+            if wait_ready is not None and not meta_ready:
+                fetch_now = await wait_ready(min(_CALLBACK_WAIT, deadline - time.monotonic()))
+                if not fetch_now:
+                    logger.debug("No Affinda callback for %s after %ss, polling", doc_identifier, _CALLBACK_WAIT)
+            
+            while not (meta_ready and self._has_resume_data(doc_response)) and time.monotonic() < deadline:
+                if fetch_now:
+                    fetch_now = False
+                elif wait_ready is not None:
+                    await wait_ready(interval * random.uniform(0.8, 1.2))
+                else:
+                    await asyncio.sleep(interval * random.uniform(0.8, 1.2))
+                
+                get_response = await client.get(get_url, headers=headers)
+                interval = min(interval * 2, _MAX_POLL_INTERVAL)
+                if get_response.status_code >= 500:
+                    logger.debug("Transient error while polling: %s", get_response.status_code)
+                    continue
+                if get_response.status_code != 200:
+                    raise Exception(f"Failed to get document status: {get_response.status_code} - {get_response.text}")
+                
+                doc_response = _loads(get_response.content)
+                meta_ready, last_debug = self._check_poll_response(doc_response, start_time, last_debug)
+        
+        # Conversion is pure-Python dict walking; keep it off the event loop so
+        # other in-flight parses can keep polling
+        return await asyncio.to_thread(self._finish, doc_response, meta_ready, cache_key)
+    
+    async def parse_many(self, file_paths: List[str], concurrency: Optional[int] = None) -> List[Any]:
+        """
+        Parse several resumes concurrently over one shared connection pool.
+        
+        At most `concurrency` documents (default `settings.affinda_concurrency`)
+        are in flight at once. Results are returned in input order; a failed parse
+        yields its exception in place of a result rather than aborting the batch.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.affinda_concurrency)
+        
+        async with self._async_client() as client:
+            async def parse_one(file_path: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.parse_to_structured_json_async(file_path, Path(file_path).suffix.lower(), client)
+            
+            return await asyncio.gather(*(parse_one(p) for p in file_paths), return_exceptions=True)
+    
+    @asynccontextmanager
+    async def _ready_subscription(self, identifier: str):
+        """
+        Subscribe to notify_document_ready(identifier) for the length of one parse.
+        
+        Yields an async wait(timeout) that returns True as soon as the document is
+        reported ready (or already was when subscribing) and False once `timeout`
+        seconds pass without that; yields None if Redis is unreachable.
+        """
+        key = _READY_KEY.format(identifier)
+        wait_ready = None
+        async with AsyncExitStack() as stack:
+            try:
+                conn = await stack.enter_async_context(aioredis.Redis.from_url(settings.redis_url, socket_connect_timeout=1))
+                pubsub = await stack.enter_async_context(conn.pubsub())
+                await pubsub.subscribe(key)
+                already_ready = bool(await conn.exists(key))
+            except redis.RedisError as e:
+                logger.debug("Callback wait unavailable, polling instead: %s", e)
+            else:
+                lost = False
+                
+                async def wait_ready(timeout: float) -> bool:
+                    nonlocal already_ready, lost
+                    if already_ready:
+                        already_ready = False
+                        return True
+                    deadline = time.monotonic() + timeout
+                    while not lost and (remaining := deadline - time.monotonic()) > 0:
+                        try:
+                            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+                        except redis.RedisError as e:
+                            logger.debug("Lost callback subscription, polling instead: %s", e)
+                            lost = True
+                        else:
+                            if message is not None:
+                                return True
+                    if lost:
+                        # Subscription gone: behave as a plain backoff sleep
+                        await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+                    return False
+            
+            yield wait_ready
+    
+    def _async_client(self) -> httpx.AsyncClient:
+        """HTTP client for async parses; keep-alive lets polls and batch uploads reuse connections"""
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, read=120.0),
+            limits=httpx.Limits(max_connections=16, keepalive_expiry=60.0)
+        )
+    
+    def _check_configured(self) -> None:
+        """Raise if the API key or workspace is missing"""
         if not self.api_key:
             raise ValueError("AFFINDA_API_KEY not configured. Set AFFINDA_API_KEY in .env file.")
         if not self.workspace_id:
             raise ValueError("AFFINDA_WORKSPACE_ID not configured. Set AFFINDA_WORKSPACE_ID in .env file.")
+    
+    def _inspect_file(self, file_path: str) -> Tuple[str, str]:
+        """
+        MIME type from the file's magic bytes, and a cache key from its content hash.
         
-        # Use the documents endpoint as per Affinda documentation
-        url = "https://api.us1.affinda.com/v3/documents"
-        
-        # Verify API key is set and format header correctly
-        if not self.api_key:
-            raise ValueError("AFFINDA_API_KEY is not set or is empty")
-        
-        # Strip any whitespace and create authorization header
-        api_key_clean = self.api_key.strip()
-        headers = {"Authorization": f"Bearer {api_key_clean}"}
-        # Note: Don't set Content-Type for multipart/form-data - requests library sets it automatically with boundary
-        # Upload the document - file must be opened during the request
+        Raises ValueError for empty files and anything that is not a PDF or DOCX,
+        whatever the extension says.
+        """
         with open(file_path, "rb") as f:
-            file_path_obj = Path(file_path)
-            files = {"file": (file_path_obj.name, f, "application/pdf" if file_path_obj.suffix.lower() == ".pdf" else "application/vnd.openxmlformats-officedocument.wordprocessingml.document")}
-            data = {
-                "workspace": self.workspace_id,
-                "documentType": self.document_type,
-                "wait": True,
-                ##"extractor": "resume"  # Specify extractor type to ensure resume parsing
-            }
-            response = requests.post(url, headers=headers, files=files, data=data, timeout=120)
-        
+            header = f.read(len(_PDF_MAGIC))
+            if header.startswith(_PDF_MAGIC):
+                mime_type = _PDF_MIME
+            elif header.startswith(_DOCX_MAGIC):
+                mime_type = _DOCX_MIME
+            elif not header:
+                raise ValueError(f"Resume file is empty: {Path(file_path).name}")
+            else:
+                raise ValueError(f"Unsupported resume format (expected PDF or DOCX): {Path(file_path).name}")
+            f.seek(0)
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        return mime_type, f"affinda:v{_CACHE_VERSION}:{self.document_type}:{digest}"
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """Authorization header for Affinda requests"""
+        # Note: Don't set Content-Type for multipart/form-data - the HTTP client sets it automatically with boundary
+        return {"Authorization": f"Bearer {self.api_key.strip()}"}
+    
+    def _upload_payload(
+        self,
+        file_path: str,
+        file_obj: BinaryIO,
+        mime_type: str,
+        wait: bool,
+        callback_url: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Multipart file and form fields for the document upload; `wait` asks Affinda to
+        respond only once processed, `callback_url` to POST there when it is
+        """
+        files = {"file": (Path(file_path).name, file_obj, mime_type)}
+        data = {
+            "workspace": self.workspace_id,
+            "documentType": self.document_type,
+            "wait": wait,
+            ##"extractor": "resume"  # Specify extractor type to ensure resume parsing
+        }
+        if callback_url:
+            data["callbackUrl"] = callback_url
+        return files, data
+    
+    def _check_upload_response(self, response) -> Dict[str, Any]:
+        """Raise on a failed upload (requests or httpx response), else return the decoded body"""
         # Check for errors and log details
         if response.status_code != 200 and response.status_code != 201:
             error_detail = response.text
             try:
-                error_json = response.json()
+                error_json = _loads(response.content)
                 error_detail = error_json
             except:
                 pass
-            print(f"[AFFINDA ERROR] Status {response.status_code}: {error_detail}")
+            logger.error("Upload failed with status %s: %s", response.status_code, error_detail)
             response.raise_for_status()
         
-        doc_response = response.json()
-        print(f"[AFFINDA DEBUG] Document upload response keys: {list(doc_response.keys())}")
-        
-        # Extract document identifier from response
+        doc_response = _loads(response.content)
+        logger.debug("Document upload response keys: %s", list(doc_response.keys()))
+        return doc_response
+    
+    def _document_identifier(self, doc_response: Dict[str, Any]) -> str:
+        """Document identifier from the upload response"""
         # The identifier is in meta.identifier based on the API response structure
         meta = doc_response.get("meta", {})
         doc_identifier = meta.get("identifier") or doc_response.get("identifier") or doc_response.get("id")
@@ -119,241 +630,176 @@ class TextkernelParser(BaseResumeParser):
         if not doc_identifier:
             raise Exception(f"Failed to get document identifier from response. Available keys: {list(doc_response.keys())}")
         
-        print(f"[AFFINDA DEBUG] Document identifier: {doc_identifier}")
-        
         # Debug key meta fields from upload response
-        print(f"[AFFINDA DEBUG] === UPLOAD RESPONSE META FIELDS ===")
-        print(f"[AFFINDA DEBUG] - ready: {meta.get('ready', 'N/A')}")
-        print(f"[AFFINDA DEBUG] - failed: {meta.get('failed', 'N/A')}")
-        print(f"[AFFINDA DEBUG] - extractor: {doc_response.get('extractor', 'N/A')}")
-        print(f"[AFFINDA DEBUG] - documentType: {meta.get('documentType', 'N/A')}")
-        print(f"[AFFINDA DEBUG] - isRejected: {meta.get('isRejected', 'N/A')}")
-        print(f"[AFFINDA DEBUG] - errorCode: {meta.get('errorCode', 'N/A')}")
-        print(f"[AFFINDA DEBUG] - errorDetail: {meta.get('errorDetail', 'N/A')}")
-        print(f"[AFFINDA DEBUG] - error (top level): {doc_response.get('error', 'N/A')}")
-        print(f"[AFFINDA DEBUG] - warnings: {doc_response.get('warnings', 'N/A')}")
-        print(f"[AFFINDA DEBUG] ====================================")
-        
-        # Poll the API endpoint to wait for processing to complete
-        max_wait_time = 60  # seconds
-        wait_interval = 2  # seconds
-        elapsed_time = 0
-        
-        # Use documents endpoint for retrieving the document
-        get_url = f"https://api.affinda.com/v3/documents/{doc_identifier}"
-        
-        # Check initial state
+        logger.debug(
+            "Document %s uploaded: ready=%s failed=%s extractor=%s documentType=%s isRejected=%s "
+            "errorCode=%s errorDetail=%s error=%s warnings=%s",
+            doc_identifier, meta.get('ready', 'N/A'), meta.get('failed', 'N/A'),
+            doc_response.get('extractor', 'N/A'), meta.get('documentType', 'N/A'),
+            meta.get('isRejected', 'N/A'), meta.get('errorCode', 'N/A'), meta.get('errorDetail', 'N/A'),
+            doc_response.get('error', 'N/A'), doc_response.get('warnings', 'N/A')
+        )
+        return doc_identifier
+    
+    def _check_poll_response(self, doc_response: Dict[str, Any], start_time: float, last_debug: float) -> Tuple[bool, float]:
+        """Log one polled document state and raise if processing failed; returns (ready, last_debug)"""
+        meta = doc_response.get("meta", {})
         meta_ready = meta.get("ready", False)
-        print(f"[AFFINDA DEBUG] Initial ready state from upload response: {meta_ready}")
+        meta_failed = meta.get("failed", False)
         
-        # Poll until document is ready
-        while not meta_ready and elapsed_time < max_wait_time:
-            time.sleep(wait_interval)
-            elapsed_time += wait_interval
-            
-            # Get document status
-            get_response = requests.get(get_url, headers=headers, timeout=30)
-            if get_response.status_code != 200:
-                raise Exception(f"Failed to get document status: {get_response.status_code} - {get_response.text}")
-            
-            doc_response = get_response.json()
-            meta = doc_response.get("meta", {})
-            meta_ready = meta.get("ready", False)
-            meta_failed = meta.get("failed", False)
-            
-            print(f"[AFFINDA DEBUG] Doc state after {elapsed_time}s: ready={meta_ready}, failed={meta_failed}")
-            
-            # Debug key fields during polling
-            if elapsed_time % 6 == 0:  # Print every 6 seconds to avoid spam
-                print(f"[AFFINDA DEBUG] === POLLING STATUS (t={elapsed_time}s) ===")
-                print(f"[AFFINDA DEBUG] - ready: {meta_ready}")
-                print(f"[AFFINDA DEBUG] - failed: {meta_failed}")
-                print(f"[AFFINDA DEBUG] - extractor: {doc_response.get('extractor', 'N/A')}")
-                print(f"[AFFINDA DEBUG] - documentType: {meta.get('documentType', 'N/A')}")
-                print(f"[AFFINDA DEBUG] - isRejected: {meta.get('isRejected', 'N/A')}")
-                print(f"[AFFINDA DEBUG] - errorCode: {meta.get('errorCode', 'N/A')}")
-                print(f"[AFFINDA DEBUG] - errorDetail: {meta.get('errorDetail', 'N/A')}")
-                print(f"[AFFINDA DEBUG] - data keys count: {len(doc_response.get('data', {}).keys())}")
-                print(f"[AFFINDA DEBUG] =========================================")
-            
-            if meta_failed:
-                error_detail = meta.get("errorDetail") or doc_response.get("error", {}).get("errorDetail") or "Unknown error"
-                error_code = meta.get("errorCode") or doc_response.get("error", {}).get("errorCode", "N/A")
-                print(f"[AFFINDA ERROR] Document processing failed!")
-                print(f"[AFFINDA ERROR] - errorCode: {error_code}")
-                print(f"[AFFINDA ERROR] - errorDetail: {error_detail}")
-                raise Exception(f"Document processing failed: {error_detail} (code: {error_code})")
+        now = time.monotonic()
+        elapsed_time = now - start_time
+        logger.debug("Doc state after %.1fs: ready=%s, failed=%s", elapsed_time, meta_ready, meta_failed)
+        
+        # Debug key fields during polling
+        if now - last_debug >= 6 and logger.isEnabledFor(logging.DEBUG):  # Every 6 seconds to avoid spam
+            last_debug = now
+            logger.debug(
+                "Polling status (t=%.1fs): extractor=%s documentType=%s isRejected=%s "
+                "errorCode=%s errorDetail=%s data keys=%d",
+                elapsed_time, doc_response.get('extractor', 'N/A'), meta.get('documentType', 'N/A'),
+                meta.get('isRejected', 'N/A'), meta.get('errorCode', 'N/A'), meta.get('errorDetail', 'N/A'),
+                len(doc_response.get('data') or {})
+            )
+        
+        if meta_failed:
+            error_detail = meta.get("errorDetail") or doc_response.get("error", {}).get("errorDetail") or "Unknown error"
+            error_code = meta.get("errorCode") or doc_response.get("error", {}).get("errorCode", "N/A")
+            logger.error("Document processing failed: errorCode=%s errorDetail=%s", error_code, error_detail)
+            raise Exception(f"Document processing failed: {error_detail} (code: {error_code})")
         
+        return meta_ready, last_debug
+    
+    def _finish(self, doc_response: Dict[str, Any], meta_ready: bool, cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """Convert the final document state to our format, caching it under `cache_key` if given"""
         if not meta_ready:
-            raise Exception(f"Document processing timed out after {max_wait_time} seconds")
-        
-        # Wait a bit more after ready state to ensure data is populated
-        # Sometimes the document is marked ready but data is still being populated
-        if meta_ready:
-            print(f"[AFFINDA DEBUG] Document marked ready, waiting up to 10s for data to populate...")
-            # Poll a few more times to wait for data
-            for i in range(5):
-                time.sleep(2)
-                get_response = requests.get(get_url, headers=headers, timeout=30)
-                if get_response.status_code == 200:
-                    doc_response = get_response.json()
-                    resume_data_check = doc_response.get("data", {})
-                    if resume_data_check and isinstance(resume_data_check, dict) and len(resume_data_check) > 0:
-                        break
+            raise Exception(f"Document processing timed out after {_MAX_WAIT_TIME} seconds")
         
         # Extract the resume data from the JSON response
         # The resume data should be in the 'data' field
-        resume_data = doc_response.get("data", {})
-        meta = doc_response.get("meta", {})
+        resume_data = doc_response.get("data")
         
         # Check if data is empty but maybe the resume data is nested differently
-        if not resume_data or (isinstance(resume_data, dict) and len(resume_data) == 0):
+        if not resume_data:
             # Check if maybe the resume data is directly in the response (not nested in 'data')
-            if any(key in doc_response for key in ['name', 'emails', 'workExperience', 'work_experience', 'education']):
+            if any(key in doc_response for key in _TOP_LEVEL_RESUME_KEYS):
                 resume_data = doc_response
             else:
+                meta = doc_response.get("meta", {})
                 raise Exception(f"Document processed but no resume data available. Extractor: {doc_response.get('extractor', 'EMPTY')}, DocumentType: {meta.get('documentType', 'EMPTY')}, Failed: {meta.get('failed', False)}, IsRejected: {meta.get('isRejected', False)}")
         
         # Convert Affinda JSON response to our standard format
         try:
             result = self._convert_affinda_json_response(resume_data)
-            return result
-        except Exception as e:
-            print(f"[AFFINDA ERROR] Failed to convert response: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Failed to convert Affinda response")
             raise
+        
+        if cache_key is not None:
+            self._cache_set(cache_key, result)
+        return result
+    
+    @staticmethod
+    def _has_resume_data(doc_response: Dict[str, Any]) -> bool:
+        """Whether a document response carries resume data, under 'data' or at the top level"""
+        resume_data = doc_response.get("data")
+        if isinstance(resume_data, dict) and resume_data:
+            return True
+        return any(key in doc_response for key in _TOP_LEVEL_RESUME_KEYS)
+    
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a previously converted result, or None on a miss or if Redis is unreachable"""
+        cached = None
+        with _RECENT_RESULTS_LOCK:
+            entry = _RECENT_RESULTS.get(key)
+            if entry is not None:
+                stored_at, cached = entry
+                if time.monotonic() - stored_at < settings.affinda_cache_ttl:
+                    _RECENT_RESULTS.move_to_end(key)
+                else:
+                    del _RECENT_RESULTS[key]
+                    cached = None
+        if cached is None:
+            if time.monotonic() < self._cache_down_until:
+                return None
+            try:
+                cached = self._cache.get(key)
+            except redis.RedisError as e:
+                logger.debug("Cache unavailable, parsing via API: %s", e)
+                self._cache_down_until = time.monotonic() + _CACHE_RETRY_AFTER
+                return None
+        # Decode per hit so callers never share (and mutate) one result object
+        return _loads(cached) if cached else None
+    
+    def _cache_set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a converted result; caching is best-effort and never fails the parse"""
+        serialized = _dumps(result)
+        with _RECENT_RESULTS_LOCK:
+            _RECENT_RESULTS[key] = (time.monotonic(), serialized)
+            _RECENT_RESULTS.move_to_end(key)
+            if len(_RECENT_RESULTS) > _RECENT_RESULTS_SIZE:
+                _RECENT_RESULTS.popitem(last=False)
+        if time.monotonic() < self._cache_down_until:
+            return
+        try:
+            self._cache.setex(key, settings.affinda_cache_ttl, serialized)
+        except redis.RedisError as e:
+            logger.debug("Failed to cache parse result: %s", e)
+            self._cache_down_until = time.monotonic() + _CACHE_RETRY_AFTER
     
     def _convert_affinda_json_response(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Affinda JSON response (dict) to our standard format"""
         
         # Extract name - Affinda uses "candidateName" with nested structure
+        # e.g. {"raw": "SEBASTIAN ORTIZ", "parsed": {"firstName": {...}, "familyName": {...}}}
         name = ""
-        name_obj = resume_data.get("candidateName") or resume_data.get("name")
-        if name_obj:
-            if isinstance(name_obj, dict):
-                # Affinda returns: {"raw": "SEBASTIAN ORTIZ", "parsed": {"firstName": {...}, "familyName": {...}}}
-                # Try raw field first (simplest)
-                if name_obj.get("raw"):
-                    name = str(name_obj.get("raw")).strip()
-                else:
-                    # Try parsed structure
-                    parsed_name = name_obj.get("parsed", {})
-                    if isinstance(parsed_name, dict):
-                        first = ""
-                        last = ""
-                        # Check for firstName (could be nested)
-                        first_obj = parsed_name.get("firstName", {})
-                        if isinstance(first_obj, dict):
-                            first = first_obj.get("raw", "") or first_obj.get("parsed", "") or ""
-                        else:
-                            first = str(first_obj) if first_obj else ""
-                        
-                        # Check for familyName (could be nested)
-                        last_obj = parsed_name.get("familyName", {})
-                        if isinstance(last_obj, dict):
-                            last = last_obj.get("raw", "") or last_obj.get("parsed", "") or ""
-                        else:
-                            last = str(last_obj) if last_obj else ""
-                        
-                        if first or last:
-                            name = f"{first} {last}".strip()
-            else:
-                name = str(name_obj).strip()
+        name_obj = _pick(resume_data, _SECTION_ALIASES["name"])
+        if isinstance(name_obj, dict) and not name_obj.get("raw"):
+            # No raw field: build from the parsed structure
+            parsed_name = name_obj.get("parsed")
+            if isinstance(parsed_name, dict):
+                name = f"{_val(parsed_name.get('firstName'))} {_val(parsed_name.get('familyName'))}".strip()
+        else:
+            name = _val(name_obj).strip()
         
         # If name is still empty, try to extract from rawText
         if not name and resume_data.get("rawText"):
-            raw_text_lines = resume_data.get("rawText", "").split("\n")
-            if raw_text_lines:
-                # First line often contains the name
-                potential_name = raw_text_lines[0].strip()
-                # Basic check: if it looks like a name (2-4 words, mostly letters)
-                if potential_name and len(potential_name.split()) <= 4 and potential_name.replace(" ", "").replace("-", "").isalpha():
-                    name = potential_name
+            # First line often contains the name
+            potential_name = resume_data["rawText"].split("\n", 1)[0].strip()
+            # Basic check: if it looks like a name (2-4 words, mostly letters)
+            if _NAME_LINE_RE.fullmatch(potential_name) and len(potential_name.split()) <= 4:
+                name = potential_name
         
         # Extract contact info - Affinda may return "email" (string, list, or array) or "emails" (array)
-        email = ""
-        email_field = resume_data.get("email")
-        if email_field:
-            # If it's a list/array, extract the first item
-            if isinstance(email_field, list) and len(email_field) > 0:
-                email_obj = email_field[0]
-                if isinstance(email_obj, dict):
-                    # Try common fields for email value
-                    email = email_obj.get("value", "") or email_obj.get("raw", "") or email_obj.get("parsed", "")
-                else:
-                    email = str(email_obj)
-            # If it's already a string, use it directly
-            elif isinstance(email_field, str):
-                email = email_field
-            else:
-                email = str(email_field)
-        else:
-            # Try emails array
-            emails = resume_data.get("emails", [])
-            if emails and len(emails) > 0:
-                email_obj = emails[0]
-                if isinstance(email_obj, dict):
-                    email = email_obj.get("value", "") or email_obj.get("raw", "")
-                else:
-                    email = str(email_obj)
+        email = _val(_pick(resume_data, _SECTION_ALIASES["email"]), "value", "raw", "parsed")
         
         # Extract phone - Affinda uses "phoneNumber" (string, list, or array) or "phoneNumbers" (array)
-        phone = ""
-        phone_field = resume_data.get("phoneNumber") or resume_data.get("phone")
-        if phone_field:
-            # If it's a list/array, extract the first item
-            if isinstance(phone_field, list) and len(phone_field) > 0:
-                phone_obj = phone_field[0]
-                if isinstance(phone_obj, dict):
-                    # Try common fields for phone value
-                    parsed_phone = phone_obj.get("parsed", {})
-                    if isinstance(parsed_phone, dict):
-                        phone = parsed_phone.get("formattedNumber", "") or parsed_phone.get("nationalNumber", "") or parsed_phone.get("rawText", "")
-                    else:
-                        phone = phone_obj.get("value", "") or phone_obj.get("raw", "") or str(parsed_phone)
-                else:
-                    phone = str(phone_obj)
-            # If it's already a string, use it directly
-            elif isinstance(phone_field, str):
-                phone = phone_field
-            else:
-                phone = str(phone_field)
+        phone_field = _pick(resume_data, _SECTION_ALIASES["phone"])
+        if isinstance(phone_field, list):
+            phone_field = phone_field[0] if phone_field else None
+        if isinstance(phone_field, dict) and isinstance(phone_field.get("parsed"), dict):
+            phone = _val(phone_field["parsed"], "formattedNumber", "nationalNumber", "rawText")
         else:
-            # Try phoneNumbers array
-            phone_numbers = resume_data.get("phoneNumbers", []) or resume_data.get("phone_numbers", [])
-            if phone_numbers and len(phone_numbers) > 0:
-                phone_obj = phone_numbers[0]
-                if isinstance(phone_obj, dict):
-                    parsed_phone = phone_obj.get("parsed", {})
-                    if isinstance(parsed_phone, dict):
-                        phone = parsed_phone.get("formattedNumber", "") or parsed_phone.get("nationalNumber", "")
-                    else:
-                        phone = phone_obj.get("value", "") or phone_obj.get("raw", "")
-                else:
-                    phone = str(phone_obj)
+            phone = _val(phone_field, "value", "raw", "parsed")
         
         # Extract location
-        location_parts = []
         location = resume_data.get("location")
         if location and isinstance(location, dict):
-            if location.get("city"):
-                location_parts.append(location["city"])
-            if location.get("region"):
-                location_parts.append(location["region"])
-            if location.get("country"):
-                location_parts.append(location["country"])
-        location_str = ", ".join(location_parts)
+            location_str = ", ".join([part for part in (location.get("city"), location.get("region"), location.get("country")) if part])
+        else:
+            location_str = ""
         
         # Extract summary
-        summary = resume_data.get("summary", "") or resume_data.get("summaryText", "")
+        summary = _pick(resume_data, _SECTION_ALIASES["summary"]) or ""
         
+        _fd = self._format_date_from_json
+
         # Extract experience
         experience = []
-        work_experience = resume_data.get("workExperience", []) or resume_data.get("work_experience", [])
+        work_experience = _pick(resume_data, _SECTION_ALIASES["experience"])
         if work_experience:
-            for idx, position in enumerate(work_experience):
-                if isinstance(position, dict):
+            for position in work_experience:
+                if type(position) is dict:
                     # Affinda returns experience entries with 'raw' and 'parsed' fields
                     # The actual data is in the 'parsed' field
                     parsed_exp = position.get("parsed", {})
@@ -363,65 +809,31 @@ class TextkernelParser(BaseResumeParser):
                     
                     # Extract from parsed field (the actual structured data)
                     # Affinda uses prefixed field names: workExperienceJobTitle, workExperienceOrganization, etc.
-                    if isinstance(parsed_exp, dict):
+                    if type(parsed_exp) is dict:
                         # Job title - Affinda uses workExperienceJobTitle
-                        job_title_obj = (parsed_exp.get("workExperienceJobTitle") or 
-                                        parsed_exp.get("jobTitle") or 
-                                        parsed_exp.get("job_title") or 
-                                        parsed_exp.get("title"))
-                        if isinstance(job_title_obj, dict):
-                            job_title = job_title_obj.get("raw", "") or job_title_obj.get("parsed", "") or ""
-                        else:
-                            job_title = str(job_title_obj) if job_title_obj else ""
+                        job_title = _val(_pick(parsed_exp, _EXP_FIELDS["title"]))
                         
                         # Company/Organization - Affinda uses workExperienceOrganization
-                        company_obj = (parsed_exp.get("workExperienceOrganization") or 
-                                      parsed_exp.get("organization") or 
-                                      parsed_exp.get("company") or 
-                                      parsed_exp.get("employer"))
-                        if isinstance(company_obj, dict):
-                            company = company_obj.get("raw", "") or company_obj.get("parsed", "") or ""
-                        else:
-                            company = str(company_obj) if company_obj else ""
+                        company = _val(_pick(parsed_exp, _EXP_FIELDS["company"]))
                         
                         # Dates - Affinda uses workExperienceDates
+                        # (falls back to direct fields on the entry itself)
                         dates_obj = parsed_exp.get("workExperienceDates")
-                        if dates_obj:
-                            if isinstance(dates_obj, dict):
-                                start_date = self._format_date_from_json(dates_obj.get("startDate")) or self._format_date_from_json(dates_obj.get("start_date"))
-                                end_date = self._format_date_from_json(dates_obj.get("endDate")) or self._format_date_from_json(dates_obj.get("end_date"))
-                            else:
-                                # Try direct fields
-                                start_date = self._format_date_from_json(parsed_exp.get("startDate")) or self._format_date_from_json(parsed_exp.get("start_date"))
-                                end_date = self._format_date_from_json(parsed_exp.get("endDate")) or self._format_date_from_json(parsed_exp.get("end_date"))
-                        else:
-                            start_date = self._format_date_from_json(parsed_exp.get("startDate")) or self._format_date_from_json(parsed_exp.get("start_date"))
-                            end_date = self._format_date_from_json(parsed_exp.get("endDate")) or self._format_date_from_json(parsed_exp.get("end_date"))
+                        src = dates_obj if dates_obj and isinstance(dates_obj, dict) else parsed_exp
+                        start_date = _fd(src.get("startDate") or src.get("start_date"))
+                        end_date = _fd(src.get("endDate") or src.get("end_date"))
                         
                         # Location - Affinda uses workExperienceLocation
-                        location_obj = (parsed_exp.get("workExperienceLocation") or 
-                                       parsed_exp.get("location", {}))
-                        if isinstance(location_obj, dict):
-                            location = location_obj.get("city", "") or location_obj.get("raw", "") or location_obj.get("formatted", "") or ""
-                        else:
-                            location = str(location_obj) if location_obj else ""
+                        location = _val(_pick(parsed_exp, _EXP_FIELDS["location"]), "city", "raw", "formatted")
                         
                         # Description - Affinda uses workExperienceDescription
-                        description_obj = (parsed_exp.get("workExperienceDescription") or 
-                                          parsed_exp.get("description") or 
-                                          parsed_exp.get("summary"))
-                        if isinstance(description_obj, dict):
-                            description = description_obj.get("raw", "") or description_obj.get("parsed", "") or ""
-                        else:
-                            description = str(description_obj) if description_obj else ""
+                        description = _val(_pick(parsed_exp, _EXP_FIELDS["description"]))
                         
                         # Achievements/Highlights - might be in description or separate
-                        achievements = (parsed_exp.get("achievements", []) or 
-                                        parsed_exp.get("highlights", []) or 
-                                        parsed_exp.get("responsibilities", []))
+                        achievements = _pick(parsed_exp, _EXP_FIELDS["achievements"]) or []
                         # Handle if achievements is a list of objects
                         if achievements and len(achievements) > 0 and isinstance(achievements[0], dict):
-                            achievements = [a.get("raw", "") or a.get("parsed", "") or str(a) for a in achievements if a]
+                            achievements = [_val(a) or str(a) for a in achievements if a]
                         
                         exp_entry = {
                             "title": job_title.strip() if job_title else "",
@@ -448,10 +860,10 @@ class TextkernelParser(BaseResumeParser):
         
         # Extract education
         education = []
-        education_list = resume_data.get("education", [])
+        education_list = resume_data.get("education")
         if education_list:
-            for idx, degree in enumerate(education_list):
-                if isinstance(degree, dict):
+            for degree in education_list:
+                if type(degree) is dict:
                     # Affinda returns education entries with 'raw' and 'parsed' fields
                     # The actual data is in the 'parsed' field
                     parsed_edu = degree.get("parsed", {})
@@ -461,71 +873,29 @@ class TextkernelParser(BaseResumeParser):
                     
                     # Extract from parsed field (the actual structured data)
                     # Affinda uses prefixed field names: educationAccreditation, educationOrganization, etc.
-                    if isinstance(parsed_edu, dict):
+                    if type(parsed_edu) is dict:
                         # Degree - Affinda uses educationAccreditation or educationLevel
-                        degree_obj = (parsed_edu.get("educationAccreditation") or 
-                                     parsed_edu.get("educationLevel") or
-                                     parsed_edu.get("degree") or 
-                                     parsed_edu.get("accreditation") or 
-                                     parsed_edu.get("qualification"))
-                        if isinstance(degree_obj, dict):
-                            degree_name = degree_obj.get("raw", "") or degree_obj.get("parsed", "") or ""
-                        else:
-                            degree_name = str(degree_obj) if degree_obj else ""
+                        degree_name = _val(_pick(parsed_edu, _EDU_FIELDS["degree"]))
                         
                         # Institution - Affinda uses educationOrganization
-                        institution_obj = (parsed_edu.get("educationOrganization") or 
-                                          parsed_edu.get("organization") or 
-                                          parsed_edu.get("institution") or 
-                                          parsed_edu.get("school") or 
-                                          parsed_edu.get("university"))
-                        if isinstance(institution_obj, dict):
-                            institution = institution_obj.get("raw", "") or institution_obj.get("parsed", "") or ""
-                        else:
-                            institution = str(institution_obj) if institution_obj else ""
+                        institution = _val(_pick(parsed_edu, _EDU_FIELDS["institution"]))
                         
                         # Dates - Affinda uses educationDates
                         dates_obj = parsed_edu.get("educationDates")
-                        if dates_obj:
-                            if isinstance(dates_obj, dict):
-                                graduation_date = self._format_date_from_json(dates_obj.get("endDate")) or self._format_date_from_json(dates_obj.get("graduation_date")) or self._format_date_from_json(dates_obj.get("date"))
-                            else:
-                                graduation_date = self._format_date_from_json(parsed_edu.get("endDate")) or self._format_date_from_json(parsed_edu.get("graduation_date")) or self._format_date_from_json(parsed_edu.get("date"))
-                        else:
-                            graduation_date = self._format_date_from_json(parsed_edu.get("endDate")) or self._format_date_from_json(parsed_edu.get("graduation_date")) or self._format_date_from_json(parsed_edu.get("date"))
+                        src = dates_obj if dates_obj and isinstance(dates_obj, dict) else parsed_edu
+                        graduation_date = _fd(src.get("endDate") or src.get("graduation_date") or src.get("date"))
                         
                         # GPA - Affinda uses educationGrade
-                        gpa_obj = (parsed_edu.get("educationGrade") or 
-                                  parsed_edu.get("gpa"))
-                        if isinstance(gpa_obj, dict):
-                            gpa = gpa_obj.get("raw", "") or gpa_obj.get("parsed", "") or ""
-                        else:
-                            gpa = str(gpa_obj) if gpa_obj else ""
+                        gpa = _val(_pick(parsed_edu, _EDU_FIELDS["gpa"]))
                         
                         # Major - Affinda uses educationMajor
-                        major_obj = (parsed_edu.get("educationMajor") or 
-                                    parsed_edu.get("major"))
-                        major = ""
-                        if isinstance(major_obj, dict):
-                            major = major_obj.get("raw", "") or major_obj.get("parsed", "") or ""
-                        elif isinstance(major_obj, list):
-                            majors: List[str] = []
-                            for m in major_obj:
-                                if isinstance(m, dict):
-                                    majors.append(m.get("raw", "") or m.get("parsed", "") or m.get("value", "") or "")
-                                elif m is not None:
-                                    majors.append(str(m))
-                            majors = [x.strip() for x in majors if isinstance(x, str) and x.strip()]
+                        major_obj = _pick(parsed_edu, _EDU_FIELDS["major"])
+                        if isinstance(major_obj, list):
+                            majors = (_val(m, "raw", "parsed", "value").strip() for m in major_obj)
                             # De-dupe while preserving order
-                            seen = set()
-                            majors_deduped = []
-                            for x in majors:
-                                if x not in seen:
-                                    seen.add(x)
-                                    majors_deduped.append(x)
-                            major = ", ".join(majors_deduped)
+                            major = ", ".join(dict.fromkeys(x for x in majors if x))
                         else:
-                            major = str(major_obj) if major_obj else ""
+                            major = _val(major_obj)
                         
                         edu_entry = {
                             "degree": degree_name.strip() if degree_name else "",
@@ -548,120 +918,95 @@ class TextkernelParser(BaseResumeParser):
         
         # Extract skills - Affinda may use "skill" (singular) or "skills" (plural)
         # Skills might also be in parsed objects with 'raw' and 'parsed' fields
-        skills = []
-        skills_list = resume_data.get("skill", []) or resume_data.get("skills", [])
+        # Keyed by casefolded name: case-insensitive dedup, keeping the first spelling seen
+        skills_by_key = {}
+        skills_list = _pick(resume_data, _SECTION_ALIASES["skills"])
         if skills_list:
             for skill in skills_list:
-                skill_name = ""
-                if isinstance(skill, dict):
-                    # Check if it's a structured object with raw/parsed
-                    if "raw" in skill or "parsed" in skill:
-                        skill_name = skill.get("raw", "") or skill.get("parsed", "") or ""
-                    else:
-                        # Try standard fields
-                        skill_name = skill.get("name", "") or skill.get("value", "") or skill.get("skill", "")
-                else:
-                    skill_name = str(skill)
-                
-                if skill_name and skill_name.strip() and skill_name not in skills:
-                    skills.append(skill_name.strip())
+                # Structured object with raw/parsed, or one of the standard fields
+                skill_name = _val(skill, "raw", "parsed", "name", "value", "skill").strip()
+                if skill_name:
+                    skills_by_key.setdefault(skill_name.casefold(), skill_name)
+        skills = list(skills_by_key.values())
         
         # Extract certifications
-        certifications = []
-        certs_list = resume_data.get("certifications", [])
-        if certs_list:
-            for cert in certs_list:
-                if isinstance(cert, dict):
-                    cert_entry = {
-                        "name": cert.get("name", ""),
-                        "issuer": cert.get("issuer", ""),
-                        "date": self._format_date_from_json(cert.get("date")) or cert.get("date", "")
-                    }
-                    certifications.append(cert_entry)
+        certifications = [
+            {
+                "name": cert.get("name", ""),
+                "issuer": cert.get("issuer", ""),
+                "date": _fd(cert.get("date")) or cert.get("date", "")
+            }
+            for cert in resume_data.get("certifications") or ()
+            if type(cert) is dict
+        ]
         
         # Extract languages - Affinda may use "language" (singular) or "languages" (plural)
         languages = []
-        langs_list = resume_data.get("language", []) or resume_data.get("languages", [])
+        langs_list = _pick(resume_data, _SECTION_ALIASES["languages"])
         if langs_list:
             for lang in langs_list:
-                if isinstance(lang, dict):
-                    lang_name = lang.get("name", "") or lang.get("value", "")
+                if type(lang) is dict:
+                    lang_name = _pick(lang, _LANGUAGE_KEYS)
                 else:
-                    lang_name = str(lang)
+                    lang_name = lang if type(lang) is str else str(lang)
                 if lang_name:
                     languages.append(lang_name)
+            # Drop repeated languages, keeping first-seen order
+            languages = list(dict.fromkeys(languages))
         
         # Extract projects
         projects = []
-        projects_list = resume_data.get("project", []) or resume_data.get("projects", [])
+        projects_list = _pick(resume_data, _SECTION_ALIASES["projects"])
         if projects_list:
             for project in projects_list:
-                if isinstance(project, dict):
+                if type(project) is dict:
                     # Projects might have raw/parsed structure
-                    parsed_proj = project.get("parsed", {})
-                    if isinstance(parsed_proj, dict):
-                        project_name = parsed_proj.get("name", "") or parsed_proj.get("title", "") or project.get("raw", "")
-                        project_desc = parsed_proj.get("description", "") or parsed_proj.get("summary", "")
-                    else:
-                        project_name = project.get("name", "") or project.get("title", "") or project.get("raw", "")
-                        project_desc = project.get("description", "") or project.get("summary", "")
+                    project_name, project_desc = _item_fields(project, _ITEM_FIELDS["name"], _ITEM_FIELDS["description"])
                     
                     if project_name or project_desc:
                         projects.append({
-                            "name": str(project_name).strip() if project_name else "",
-                            "description": str(project_desc).strip() if project_desc else ""
+                            "name": _text(project_name) if project_name else "",
+                            "description": _text(project_desc) if project_desc else ""
                         })
                 else:
-                    projects.append({"name": str(project).strip(), "description": ""})
+                    projects.append({"name": _text(project), "description": ""})
         
         # Extract achievements
         achievements = []
-        achievements_list = resume_data.get("achievement", []) or resume_data.get("achievements", [])
+        achievements_list = _pick(resume_data, _SECTION_ALIASES["achievements"])
         if achievements_list:
             for achievement in achievements_list:
-                if isinstance(achievement, dict):
+                if type(achievement) is dict:
                     # Achievements might have raw/parsed structure
-                    parsed_ach = achievement.get("parsed", {})
-                    if isinstance(parsed_ach, dict):
-                        ach_name = parsed_ach.get("name", "") or parsed_ach.get("title", "") or achievement.get("raw", "")
-                        ach_desc = parsed_ach.get("description", "") or parsed_ach.get("summary", "")
-                    else:
-                        ach_name = achievement.get("name", "") or achievement.get("title", "") or achievement.get("raw", "")
-                        ach_desc = achievement.get("description", "") or achievement.get("summary", "")
+                    ach_name, ach_desc = _item_fields(achievement, _ITEM_FIELDS["name"], _ITEM_FIELDS["description"])
                     
                     if ach_name or ach_desc:
                         achievements.append({
-                            "name": str(ach_name).strip() if ach_name else "",
-                            "description": str(ach_desc).strip() if ach_desc else ""
+                            "name": _text(ach_name) if ach_name else "",
+                            "description": _text(ach_desc) if ach_desc else ""
                         })
                 else:
-                    achievements.append({"name": str(achievement).strip(), "description": ""})
+                    achievements.append({"name": _text(achievement), "description": ""})
         
         # Extract associations/extracurriculars
         associations = []
-        associations_list = resume_data.get("association", []) or resume_data.get("associations", [])
+        associations_list = _pick(resume_data, _SECTION_ALIASES["associations"])
         if associations_list:
             for association in associations_list:
-                if isinstance(association, dict):
+                if type(association) is dict:
                     # Associations might have raw/parsed structure
-                    parsed_assoc = association.get("parsed", {})
-                    if isinstance(parsed_assoc, dict):
-                        assoc_name = parsed_assoc.get("name", "") or parsed_assoc.get("organization", "") or association.get("raw", "")
-                        assoc_role = parsed_assoc.get("role", "") or parsed_assoc.get("position", "")
-                    else:
-                        assoc_name = association.get("name", "") or association.get("organization", "") or association.get("raw", "")
-                        assoc_role = association.get("role", "") or association.get("position", "")
+                    assoc_name, assoc_role = _item_fields(association, _ASSOC_FIELDS["name"], _ASSOC_FIELDS["role"])
                     
                     if assoc_name:
                         associations.append({
-                            "name": str(assoc_name).strip() if assoc_name else "",
-                            "role": str(assoc_role).strip() if assoc_role else ""
+                            "name": _text(assoc_name) if assoc_name else "",
+                            "role": _text(assoc_role) if assoc_role else ""
                         })
                 else:
-                    associations.append({"name": str(association).strip(), "role": ""})
+                    associations.append({"name": _text(association), "role": ""})
         
         # Get raw text
-        raw_text = resume_data.get("rawText", "") or resume_data.get("raw_text", "")
+        raw_text = _pick(resume_data, _SECTION_ALIASES["raw_text"]) or ""
         
         return {
             "name": name,
@@ -680,7 +1025,7 @@ class TextkernelParser(BaseResumeParser):
             "raw_text": raw_text,
             "metadata": {
                 "parser": "affinda",
-                "detected_language": resume_data.get("detectedLanguage", "") or resume_data.get("detected_language", "")
+                "detected_language": _pick(resume_data, _SECTION_ALIASES["detected_language"]) or ""
             }
         }
     
@@ -689,21 +1034,10 @@ class TextkernelParser(BaseResumeParser):
         if not date_obj:
             return ""
         
-        if isinstance(date_obj, str):
-            # Try to parse ISO format date string
-            try:
-                from datetime import datetime
-                # Handle ISO format with or without timezone
-                date_str = date_obj.replace('Z', '+00:00')
-                dt = datetime.fromisoformat(date_str)
-                return dt.strftime("%Y-%m-%d")
-            except:
-                # If parsing fails, return as-is if it looks like a date
-                if len(date_obj) >= 10:
-                    return date_obj[:10]  # Take first 10 chars (YYYY-MM-DD)
-                return date_obj
+        if type(date_obj) is str:
+            return _format_date_str(date_obj)
         
-        if isinstance(date_obj, dict):
+        if type(date_obj) is dict:
             # Could be {"year": 2023, "month": 12, "day": 1} or {"date": "2023-12-01"}
             if "date" in date_obj:
                 return str(date_obj["date"])
@@ -715,124 +1049,13 @@ class TextkernelParser(BaseResumeParser):
         
         return str(date_obj)
     
-    def _convert_affinda_response(self, parsed_resume) -> Dict[str, Any]:
-        """Convert Affinda parsed resume object to our standard format"""
-        
-        # Extract name
-        name = ""
-        if hasattr(parsed_resume, 'name') and parsed_resume.name:
-            if hasattr(parsed_resume.name, 'first'):
-                name = parsed_resume.name.first or ""
-            if hasattr(parsed_resume.name, 'last') and parsed_resume.name.last:
-                name = f"{name} {parsed_resume.name.last}".strip()
-        
-        # Extract contact info
-        email = ""
-        if hasattr(parsed_resume, 'emails') and parsed_resume.emails:
-            email = parsed_resume.emails[0].value if hasattr(parsed_resume.emails[0], 'value') else str(parsed_resume.emails[0])
-        
-        phone = ""
-        if hasattr(parsed_resume, 'phone_numbers') and parsed_resume.phone_numbers:
-            phone = parsed_resume.phone_numbers[0].value if hasattr(parsed_resume.phone_numbers[0], 'value') else str(parsed_resume.phone_numbers[0])
-        
-        # Extract location
-        location_parts = []
-        if hasattr(parsed_resume, 'location') and parsed_resume.location:
-            if hasattr(parsed_resume.location, 'city') and parsed_resume.location.city:
-                location_parts.append(parsed_resume.location.city)
-            if hasattr(parsed_resume.location, 'region') and parsed_resume.location.region:
-                location_parts.append(parsed_resume.location.region)
-            if hasattr(parsed_resume.location, 'country') and parsed_resume.location.country:
-                location_parts.append(parsed_resume.location.country)
-        location = ", ".join(location_parts)
-        
-        # Extract summary
-        summary = parsed_resume.summary if hasattr(parsed_resume, 'summary') and parsed_resume.summary else ""
-        
-        # Extract experience
-        experience = []
-        if hasattr(parsed_resume, 'work_experience') and parsed_resume.work_experience:
-            for position in parsed_resume.work_experience:
-                exp_entry = {
-                    "title": position.job_title if hasattr(position, 'job_title') else "",
-                    "company": position.organization if hasattr(position, 'organization') else "",
-                    "start_date": position.start_date.strftime("%Y-%m-%d") if hasattr(position, 'start_date') and position.start_date else "",
-                    "end_date": position.end_date.strftime("%Y-%m-%d") if hasattr(position, 'end_date') and position.end_date else "",
-                    "location": position.location.city if hasattr(position, 'location') and position.location and hasattr(position.location, 'city') else "",
-                    "description": position.description if hasattr(position, 'description') else "",
-                    "highlights": position.achievements if hasattr(position, 'achievements') else []
-                }
-                experience.append(exp_entry)
-        
-        # Extract education
-        education = []
-        if hasattr(parsed_resume, 'education') and parsed_resume.education:
-            for degree in parsed_resume.education:
-                edu_entry = {
-                    "degree": degree.degree if hasattr(degree, 'degree') else "",
-                    "institution": degree.organization if hasattr(degree, 'organization') else "",
-                    "graduation_date": degree.end_date.strftime("%Y-%m-%d") if hasattr(degree, 'end_date') and degree.end_date else "",
-                    "gpa": degree.gpa if hasattr(degree, 'gpa') else "",
-                    "major": degree.major if hasattr(degree, 'major') else ""
-                }
-                education.append(edu_entry)
-        
-        # Extract skills
-        skills = []
-        if hasattr(parsed_resume, 'skills') and parsed_resume.skills:
-            for skill in parsed_resume.skills:
-                skill_name = skill.name if hasattr(skill, 'name') else str(skill)
-                if skill_name and skill_name not in skills:
-                    skills.append(skill_name)
-        
-        # Extract certifications
-        certifications = []
-        if hasattr(parsed_resume, 'certifications') and parsed_resume.certifications:
-            for cert in parsed_resume.certifications:
-                cert_entry = {
-                    "name": cert.name if hasattr(cert, 'name') else "",
-                    "issuer": cert.issuer if hasattr(cert, 'issuer') else "",
-                    "date": cert.date.strftime("%Y-%m-%d") if hasattr(cert, 'date') and cert.date else ""
-                }
-                certifications.append(cert_entry)
-        
-        # Extract languages
-        languages = []
-        if hasattr(parsed_resume, 'languages') and parsed_resume.languages:
-            for lang in parsed_resume.languages:
-                lang_name = lang.name if hasattr(lang, 'name') else str(lang)
-                if lang_name:
-                    languages.append(lang_name)
-        
-        # Get raw text
-        raw_text = parsed_resume.raw_text if hasattr(parsed_resume, 'raw_text') else ""
-        
-        return {
-            "name": name,
-            "email": email,
-            "phone": phone,
-            "location": location,
-            "summary": summary,
-            "experience": experience,
-            "education": education,
-            "skills": skills,
-            "certifications": certifications,
-            "languages": languages,
-            "raw_text": raw_text,
-            "metadata": {
-                "parser": "affinda",
-                "detected_language": parsed_resume.detected_language if hasattr(parsed_resume, 'detected_language') else ""
-            }
-        }
-    
     def _format_date(self, date_obj: Optional[Dict[str, Any]]) -> str:
         """Format Textkernel date object to string"""
         if not date_obj:
             return ""
-        
-        if isinstance(date_obj, str):
+        # Plain strings are the common case; exact type check skips the MRO walk
+        if type(date_obj) is str:
             return date_obj
-        
         # Textkernel returns dates as {"Date": "YYYY-MM-DD"}
         return date_obj.get("Date", "")
 
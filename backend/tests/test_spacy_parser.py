@@ -0,0 +1,34 @@
+"""Regression tests for the spaCy parser's header-cleaning helpers."""
+
+import pytest
+
+pytest.importorskip("spacy")
+pytest.importorskip("fitz")
+pytest.importorskip("docx")
+pytest.importorskip("dateutil")
+
+from app.services.spacy_parser import SpacyResumeParser
+
+
+@pytest.fixture
+def parser():
+    # The helpers under test are pure text functions; skip loading a spaCy model
+    return SpacyResumeParser.__new__(SpacyResumeParser)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Dates are removed before locations, so "<Word>, <Month>" is not taken for a location
+    ("Software Engineer, Jan 2020", "Software Engineer,"),
+    ("Senior Engineer, Jan 2020 – Mar 2022", "Senior Engineer,"),
+    ("Analyst, Present", "Analyst,"),
+])
+def test_remove_dates_and_location(parser, text, expected):
+    assert parser._remove_dates_and_location(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("University of Texas, May 2020", "University of Texas,"),
+    ("MIT, Cambridge, MA GPA: 3.9/4.0 2019", "MIT,"),
+])
+def test_clean_education_field(parser, text, expected):
+    assert parser._clean_education_field(text) == expected